@@ -0,0 +1,100 @@
+import importlib
+
+_MODULOS = {
+    "modelo": (
+        "ROOT_PATH",
+        "FORMATO_DATA",
+        "TAMANHO_PAGINA_EXTRATO",
+        "LIMITE_SAQUE_PADRAO",
+        "TIPOS_TRANSACAO",
+        "CODIGOS_TRANSACAO",
+        "JANELAS_CONTAGEM",
+        "para_centavos",
+        "formatar_valor",
+        "avisar",
+        "configurar_relogio",
+        "normalizar_cpf",
+        "filtrar_cliente",
+        "ContaIterador",
+        "RegistroClientes",
+        "Cliente",
+        "PessoaFisica",
+        "Conta",
+        "ContaCorrente",
+        "RegistroTransacao",
+        "Historico",
+        "Transacao",
+        "travar_contas",
+        "Saque",
+        "Deposito",
+        "Transferencia",
+        "registrar_pernas",
+    ),
+    "metricas": (
+        "Histograma",
+        "Metricas",
+        "configurar_metricas",
+        "ler_metricas",
+        "contar_metrica",
+        "observar_metrica",
+    ),
+    "log": (
+        "ArquivoLog",
+        "caminho_manifesto",
+        "ler_manifesto",
+        "consultar_log",
+        "configurar_log",
+        "anotar_log",
+        "log_transacao",
+        "ler_entrada",
+        "perfilar",
+    ),
+    "perfil": ("PerfilOperacoes", "configurar_perfil"),
+    "armazenamento": ("Armazenamento", "ArmazenamentoSQLite", "DiarioTransacoes", "abrir_armazenamento"),
+    "servicos": (
+        "ExecutorTransacoes",
+        "transferir_em_lote",
+        "gerar_extrato",
+        "paginar_extrato",
+        "OPERACOES_LOTE",
+        "CAMPOS_LOTE",
+        "ler_lote",
+        "processar_lote",
+        "aplicar_registro",
+        "registrar_requisicao",
+        "importar_lote",
+    ),
+    "relatorios": (
+        "FAIXAS_SALDO",
+        "totais_por_dia",
+        "distribuicao_saldos",
+        "top_contas_por_volume",
+        "utilizacao_limite_saques",
+        "gerar_relatorio_banco",
+    ),
+    "servidor": ("ServidorFinanSys", "gerar_carga"),
+    "desempenho": (
+        "medir_memoria",
+        "gerar_banco_sintetico",
+        "executar_benchmark",
+        "gerar_carga_sintetica",
+        "reproduzir_carga",
+    ),
+}
+_ORIGEM = {nome: modulo for modulo, nomes in _MODULOS.items() for nome in nomes}
+
+__all__ = list(_ORIGEM)
+
+
+def __getattr__(nome):
+    modulo = _ORIGEM.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+    valor = getattr(importlib.import_module(f"{__name__}.{modulo}"), nome)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,494 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from array import array
+from functools import partial
+from pathlib import Path
+
+from .modelo import _PERSISTENCIA_PENDENTE, ROOT_PATH, ContaCorrente, PessoaFisica, RegistroClientes
+
+
+class Armazenamento(ABC):
+    @abstractmethod
+    def carregar(self):
+        pass
+
+    @abstractmethod
+    def salvar_cliente(self, cliente):
+        pass
+
+    @abstractmethod
+    def salvar_conta(self, conta):
+        pass
+
+    @abstractmethod
+    def _registrar_transacoes(self, registros):
+        pass
+
+    @abstractmethod
+    def fechar(self):
+        pass
+
+    def _vincular(self, conta):
+        conta.historico._ao_adicionar = partial(self._registrar_transacao, conta)
+
+    def _registrar_transacao(self, conta, codigo, valor, data):
+        registro = (conta, codigo, valor, data)
+        pendentes = _PERSISTENCIA_PENDENTE.get()
+        if pendentes is None:
+            self._registrar_transacoes([registro])
+        else:
+            pendentes.append((self._registrar_transacoes, registro))
+
+
+class ArmazenamentoSQLite(Armazenamento):
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS clientes (
+            cpf TEXT PRIMARY KEY,
+            nome TEXT NOT NULL,
+            data_nascimento TEXT,
+            endereco TEXT
+        );
+        CREATE TABLE IF NOT EXISTS contas (
+            numero INTEGER PRIMARY KEY,
+            cpf TEXT NOT NULL REFERENCES clientes (cpf),
+            agencia TEXT NOT NULL,
+            saldo INTEGER NOT NULL,
+            limite INTEGER NOT NULL,
+            limite_saques INTEGER NOT NULL,
+            janela_saques TEXT
+        );
+        CREATE INDEX IF NOT EXISTS contas_por_cpf ON contas (cpf);
+        CREATE TABLE IF NOT EXISTS transacoes (
+            conta INTEGER NOT NULL REFERENCES contas (numero),
+            tipo INTEGER NOT NULL,
+            valor INTEGER NOT NULL,
+            data REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS transacoes_por_conta ON transacoes (conta, data);
+    """
+
+    def __init__(self, caminho, tamanho_lote=500):
+        self._caminho = caminho
+        self._tamanho_lote = tamanho_lote
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._conexao.executescript(self.ESQUEMA)
+        self._trava = threading.RLock()
+        self._clientes_pendentes = []
+        self._contas_pendentes = []
+        self._transacoes_pendentes = []
+        self._saldos_pendentes = {}
+        atexit.register(self.fechar)
+
+    def carregar(self):
+        with self._trava:
+            self._descarregar()
+            por_cpf = {}
+            for cpf, nome, data_nascimento, endereco in self._conexao.execute(
+                "SELECT cpf, nome, data_nascimento, endereco FROM clientes ORDER BY rowid"
+            ):
+                por_cpf[cpf] = PessoaFisica(
+                    nome=nome, data_nascimento=data_nascimento, cpf=cpf, endereco=endereco
+                )
+
+            contas = []
+            for numero, cpf, agencia, saldo, limite, limite_saques, janela_saques in self._conexao.execute(
+                "SELECT numero, cpf, agencia, saldo, limite, limite_saques, janela_saques FROM contas ORDER BY numero"
+            ):
+                cliente = por_cpf[cpf]
+                conta = ContaCorrente(numero, cliente, limite, limite_saques, janela_saques)
+                conta._agencia = agencia
+                conta._saldo = saldo
+                conta.historico.carregar_sob_demanda(partial(self._ler_historico, numero))
+                self._vincular(conta)
+                cliente.adicionar_conta(conta)
+                contas.append(conta)
+
+        return RegistroClientes(por_cpf.values()), contas
+
+    def salvar_cliente(self, cliente):
+        with self._trava:
+            self._clientes_pendentes.append(
+                (cliente.cpf, cliente.nome, cliente.data_nascimento, cliente.endereco)
+            )
+            self._verificar_lote()
+
+    def salvar_conta(self, conta):
+        with self._trava:
+            self._contas_pendentes.append(
+                (
+                    conta.numero,
+                    conta.cliente.cpf,
+                    conta.agencia,
+                    conta.saldo,
+                    conta._limite,
+                    conta._limite_saques,
+                    conta._janela_saques,
+                )
+            )
+            self._vincular(conta)
+            self._verificar_lote()
+
+    def _registrar_transacoes(self, registros):
+        with self._trava:
+            for conta, codigo, valor, data in registros:
+                self._transacoes_pendentes.append((conta.numero, codigo, valor, data))
+                self._saldos_pendentes[conta.numero] = conta.saldo
+            self._verificar_lote()
+
+    def _ler_historico(self, numero):
+        with self._trava:
+            self._descarregar()
+            linhas = self._conexao.execute(
+                "SELECT tipo, valor, data FROM transacoes WHERE conta = ? ORDER BY rowid", (numero,)
+            ).fetchall()
+
+        if not linhas:
+            return (), (), ()
+        return tuple(zip(*linhas))
+
+    def _verificar_lote(self):
+        pendentes = (
+            len(self._clientes_pendentes)
+            + len(self._contas_pendentes)
+            + len(self._transacoes_pendentes)
+        )
+        if pendentes >= self._tamanho_lote:
+            self._descarregar()
+
+    def flush(self):
+        with self._trava:
+            self._descarregar()
+
+    def fechar(self):
+        with self._trava:
+            if self._conexao is None:
+                return
+            self._descarregar()
+            self._conexao.close()
+            self._conexao = None
+
+    def _descarregar(self):
+        if not (self._clientes_pendentes or self._contas_pendentes or self._transacoes_pendentes):
+            return
+
+        with self._conexao:
+            self._conexao.executemany(
+                "INSERT OR IGNORE INTO clientes (cpf, nome, data_nascimento, endereco) VALUES (?, ?, ?, ?)",
+                self._clientes_pendentes,
+            )
+            self._conexao.executemany(
+                "INSERT OR IGNORE INTO contas (numero, cpf, agencia, saldo, limite, limite_saques, janela_saques)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self._contas_pendentes,
+            )
+            self._conexao.executemany(
+                "INSERT INTO transacoes (conta, tipo, valor, data) VALUES (?, ?, ?, ?)",
+                self._transacoes_pendentes,
+            )
+            self._conexao.executemany(
+                "UPDATE contas SET saldo = ? WHERE numero = ?",
+                [(saldo, numero) for numero, saldo in self._saldos_pendentes.items()],
+            )
+
+        self._clientes_pendentes = []
+        self._contas_pendentes = []
+        self._transacoes_pendentes = []
+        self._saldos_pendentes = {}
+
+
+class DiarioTransacoes(Armazenamento):
+    def __init__(self, prefixo, tamanho_grupo=64, intervalo_grupo=0.05, intervalo_snapshot=10000):
+        self._prefixo = Path(prefixo)
+        self._caminho_snapshot = self._prefixo.with_name(self._prefixo.name + ".snapshot.json")
+        self._tamanho_grupo = tamanho_grupo
+        self._intervalo_grupo = intervalo_grupo
+        self._intervalo_snapshot = intervalo_snapshot
+        self._trava = threading.RLock()
+        self._grupo = []
+        self._ultimo_commit = time.monotonic()
+        self._sequencia = 0
+        self._desde_snapshot = 0
+        self._segmento = 1
+        self._clientes = RegistroClientes()
+        self._contas = {}
+        self._persistidos = {}
+        self._tamanhos_segmentos = []
+        self._historicos_indexados = None
+        self._arquivo = None
+        self._parar = threading.Event()
+        self._temporizador = None
+        atexit.register(self.fechar)
+
+    def carregar(self):
+        with self._trava:
+            sequencia_snapshot, primeiro_segmento = self._carregar_snapshot()
+            self._sequencia = sequencia_snapshot
+            segmentos = self._segmentos()
+            self._desde_snapshot = self._reaplicar_diario(
+                [caminho for indice, caminho in segmentos if indice >= primeiro_segmento], sequencia_snapshot
+            )
+            self._tamanhos_segmentos = [(caminho, caminho.stat().st_size) for _, caminho in segmentos]
+            self._segmento = max(primeiro_segmento, segmentos[-1][0] if segmentos else 1)
+
+            for conta in self._contas.values():
+                self._persistidos[conta.numero] = conta.saldo
+                if segmentos:
+                    conta.historico.carregar_sob_demanda(partial(self._ler_historico, conta.numero))
+                self._vincular(conta)
+            self._arquivo = open(self._caminho_segmento(self._segmento), "a", encoding="utf-8")
+
+        return self._clientes, list(self._contas.values())
+
+    def _caminho_segmento(self, indice):
+        return self._prefixo.with_name(f"{self._prefixo.name}.diario.{indice:06d}.jsonl")
+
+    def _segmentos(self):
+        segmentos = []
+        for caminho in self._prefixo.parent.glob(f"{self._prefixo.name}.diario.*.jsonl"):
+            indice = caminho.name[len(self._prefixo.name) + len(".diario."):-len(".jsonl")]
+            if indice.isdigit():
+                segmentos.append((int(indice), caminho))
+        return sorted(segmentos)
+
+    def _carregar_snapshot(self):
+        try:
+            snapshot = json.loads(self._caminho_snapshot.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return 0, 1
+
+        for dados in snapshot["clientes"]:
+            self._clientes.adicionar(PessoaFisica(**dados))
+
+        for dados in snapshot["contas"]:
+            conta = self._criar_conta(dados, self._clientes.buscar(dados["cpf"]))
+            conta._saldo = dados["saldo"]
+
+        return snapshot["sequencia"], snapshot["segmento"]
+
+    def _reaplicar_diario(self, caminhos, sequencia_snapshot):
+        reaplicadas = 0
+        for caminho in caminhos:
+            valido = 0
+            with open(caminho, "rb") as diario:
+                for linha in diario:
+                    if not linha.endswith(b"\n"):
+                        break
+                    try:
+                        entrada = json.loads(linha)
+                    except ValueError:
+                        break
+                    valido += len(linha)
+
+                    if entrada["seq"] <= sequencia_snapshot:
+                        continue
+
+                    self._sequencia = entrada["seq"]
+                    reaplicadas += 1
+                    evento = entrada["evento"]
+                    if evento == "cliente":
+                        self._clientes.adicionar(PessoaFisica(**entrada["dados"]))
+                    elif evento == "conta":
+                        dados = entrada["dados"]
+                        self._criar_conta(dados, self._clientes.buscar(dados["cpf"]))
+                    elif evento in ("transacao", "pernas"):
+                        for perna in entrada.get("pernas", (entrada,)):
+                            self._contas[perna["conta"]]._saldo = perna["saldo"]
+
+                descartar = diario.seek(0, os.SEEK_END) > valido
+            if descartar:
+                os.truncate(caminho, valido)
+                break
+
+        return reaplicadas
+
+    def _ler_historico(self, numero):
+        with self._trava:
+            if self._historicos_indexados is None:
+                self._historicos_indexados = self._indexar_segmentos()
+            colunas = self._historicos_indexados.pop(numero, None)
+
+        return colunas or ((), (), ())
+
+    def _indexar_segmentos(self):
+        historicos = {}
+        for caminho, tamanho in self._tamanhos_segmentos:
+            with open(caminho, "rb") as diario:
+                linhas = diario.read(tamanho).splitlines()
+
+            for linha in linhas:
+                entrada = json.loads(linha)
+                if entrada["evento"] not in ("transacao", "pernas"):
+                    continue
+                for perna in entrada.get("pernas", (entrada,)):
+                    colunas = historicos.get(perna["conta"])
+                    if colunas is None:
+                        colunas = historicos[perna["conta"]] = (array("B"), array("q"), array("d"))
+                    colunas[0].append(perna["codigo"])
+                    colunas[1].append(perna["valor"])
+                    colunas[2].append(perna["data"])
+        return historicos
+
+    def _criar_conta(self, dados, cliente):
+        conta = ContaCorrente(
+            dados["numero"], cliente, dados["limite"], dados["limite_saques"], dados["janela_saques"]
+        )
+        conta._agencia = dados["agencia"]
+        cliente.adicionar_conta(conta)
+        self._contas[conta.numero] = conta
+        return conta
+
+    def salvar_cliente(self, cliente):
+        with self._trava:
+            self._clientes.adicionar(cliente)
+            self._anexar({"evento": "cliente", "dados": _dados_cliente(cliente)})
+
+    def salvar_conta(self, conta):
+        with self._trava:
+            self._contas[conta.numero] = conta
+            self._persistidos[conta.numero] = conta.saldo
+            self._vincular(conta)
+            self._anexar({"evento": "conta", "dados": _dados_conta(conta)})
+
+    def _registrar_transacoes(self, registros):
+        with self._trava:
+            pernas = []
+            for conta, codigo, valor, data in registros:
+                self._persistidos[conta.numero] = conta.saldo
+                pernas.append(
+                    {
+                        "conta": conta.numero,
+                        "codigo": codigo,
+                        "valor": valor,
+                        "data": data,
+                        "saldo": conta.saldo,
+                    }
+                )
+
+            if len(pernas) == 1:
+                self._anexar({"evento": "transacao", **pernas[0]})
+            else:
+                self._anexar({"evento": "pernas", "pernas": pernas})
+
+    def _anexar(self, entrada):
+        with self._trava:
+            self._sequencia += 1
+            entrada["seq"] = self._sequencia
+            self._grupo.append(json.dumps(entrada, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self._desde_snapshot += 1
+
+            if (
+                len(self._grupo) >= self._tamanho_grupo
+                or time.monotonic() - self._ultimo_commit >= self._intervalo_grupo
+            ):
+                self._confirmar_grupo()
+            elif self._temporizador is None and self._intervalo_grupo:
+                self._iniciar_temporizador()
+
+            if self._intervalo_snapshot and self._desde_snapshot >= self._intervalo_snapshot:
+                self.gravar_snapshot()
+
+    def _confirmar_grupo(self):
+        self._ultimo_commit = time.monotonic()
+        if not self._grupo:
+            return
+
+        if self._arquivo is None:
+            self._arquivo = open(self._caminho_segmento(self._segmento), "a", encoding="utf-8")
+
+        self._arquivo.write("".join(self._grupo))
+        self._arquivo.flush()
+        os.fsync(self._arquivo.fileno())
+        self._grupo = []
+
+    def flush(self):
+        with self._trava:
+            self._confirmar_grupo()
+
+    def _iniciar_temporizador(self):
+        self._parar.clear()
+        self._temporizador = threading.Thread(
+            target=self._confirmar_periodicamente, name="DiarioTransacoes", daemon=True
+        )
+        self._temporizador.start()
+
+    def _confirmar_periodicamente(self):
+        while not self._parar.wait(self._intervalo_grupo):
+            self.flush()
+
+    def gravar_snapshot(self):
+        with self._trava:
+            self._confirmar_grupo()
+            snapshot = {
+                "sequencia": self._sequencia,
+                "segmento": self._segmento + 1,
+                "clientes": [_dados_cliente(cliente) for cliente in self._clientes],
+                "contas": [
+                    dict(_dados_conta(conta), saldo=self._persistidos.get(conta.numero, 0))
+                    for conta in self._contas.values()
+                ],
+            }
+
+            temporario = self._caminho_snapshot.with_name(self._caminho_snapshot.name + ".tmp")
+            with open(temporario, "w", encoding="utf-8") as arquivo:
+                json.dump(snapshot, arquivo, ensure_ascii=False, separators=(",", ":"))
+                arquivo.flush()
+                os.fsync(arquivo.fileno())
+            os.replace(temporario, self._caminho_snapshot)
+
+            if self._arquivo is not None:
+                self._arquivo.close()
+                self._arquivo = None
+            self._segmento += 1
+            self._desde_snapshot = 0
+
+    def fechar(self):
+        self._parar.set()
+        temporizador = self._temporizador
+        if temporizador is not None and temporizador is not threading.current_thread():
+            temporizador.join()
+        self._temporizador = None
+
+        with self._trava:
+            if self._arquivo is None and not self._grupo and not self._desde_snapshot:
+                return
+
+            if self._desde_snapshot:
+                self.gravar_snapshot()
+            else:
+                self._confirmar_grupo()
+
+            if self._arquivo is not None:
+                self._arquivo.close()
+                self._arquivo = None
+
+
+def _dados_cliente(cliente):
+    return {
+        "cpf": cliente.cpf,
+        "nome": cliente.nome,
+        "data_nascimento": cliente.data_nascimento,
+        "endereco": cliente.endereco,
+    }
+
+
+def _dados_conta(conta):
+    return {
+        "numero": conta.numero,
+        "cpf": conta.cliente.cpf,
+        "agencia": conta.agencia,
+        "saldo": conta.saldo,
+        "limite": conta._limite,
+        "limite_saques": conta._limite_saques,
+        "janela_saques": conta._janela_saques,
+    }
+
+
+def abrir_armazenamento(tipo, caminho=None):
+    if tipo == "diario":
+        return DiarioTransacoes(caminho or ROOT_PATH / "finansys")
+    return ArmazenamentoSQLite(caminho or str(ROOT_PATH / "finansys.db"))
@@ -0,0 +1,346 @@
+import argparse
+import json
+import os
+import sys
+from array import array
+from datetime import datetime
+from pathlib import Path
+
+from . import log
+from .log import ArquivoLog, configurar_log, consultar_log
+from .metricas import configurar_metricas
+from .modelo import ROOT_PATH
+
+
+def _data_hora_argumento(texto):
+    try:
+        return datetime.fromisoformat(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data/hora inválida: {texto!r} (use AAAA-MM-DDTHH:MM:SS)")
+
+
+def consultar_log_cli(opcoes):
+    saida = sys.stdout
+    for entrada in consultar_log(
+        caminho=opcoes.log,
+        inicio=opcoes.inicio,
+        fim=opcoes.fim,
+        funcao=opcoes.funcao,
+        cpf=opcoes.cpf,
+    ):
+        saida.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+
+
+def _valor_json(valor):
+    if isinstance(valor, array):
+        return valor.tolist()
+    if hasattr(valor, "isoformat"):
+        return valor.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+
+def relatorio_cli(opcoes):
+    from .armazenamento import abrir_armazenamento
+    from .relatorios import TAMANHO_FATIA_RELATORIO, gerar_relatorio_banco
+
+    armazenamento = abrir_armazenamento(opcoes.armazenamento, opcoes.banco)
+    _, contas = armazenamento.carregar()
+    relatorio = gerar_relatorio_banco(
+        contas, trabalhadores=opcoes.trabalhadores, tamanho_fatia=opcoes.tamanho_fatia or TAMANHO_FATIA_RELATORIO,
+        n_top=opcoes.top
+    )
+    armazenamento.fechar()
+    json.dump(relatorio, sys.stdout, ensure_ascii=False, indent=2, default=_valor_json)
+    sys.stdout.write("\n")
+
+
+def lote_cli(opcoes):
+    from .armazenamento import abrir_armazenamento
+    from .servicos import importar_lote
+
+    armazenamento = abrir_armazenamento(opcoes.armazenamento, opcoes.banco)
+    clientes, contas = armazenamento.carregar()
+    saida = open(opcoes.saida, "w", encoding="utf-8") if opcoes.saida else sys.stdout
+    try:
+        for resultado in importar_lote(opcoes.arquivo, clientes, contas, armazenamento, opcoes.formato):
+            saida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+        armazenamento.fechar()
+        log.LOG_TRANSACOES.fechar()
+
+
+def memoria_cli(opcoes):
+    from .desempenho import medir_memoria
+
+    json.dump(medir_memoria(opcoes.contas, opcoes.transacoes), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+def benchmark_cli(opcoes):
+    from .desempenho import executar_benchmark
+
+    resultado = executar_benchmark(
+        opcoes.clientes,
+        opcoes.contas_por_cliente,
+        opcoes.transacoes,
+        opcoes.semente,
+        opcoes.formato_log,
+        not opcoes.sem_memoria,
+    )
+    saida = open(opcoes.saida, "w", encoding="utf-8") if opcoes.saida else sys.stdout
+    try:
+        json.dump(resultado, saida, ensure_ascii=False, indent=2)
+        saida.write("\n")
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+
+
+def _carga_das_opcoes(opcoes):
+    from .desempenho import gerar_carga_sintetica
+
+    return gerar_carga_sintetica(
+        eventos=opcoes.eventos,
+        semente=opcoes.semente,
+        dias=opcoes.dias,
+        clientes_iniciais=opcoes.clientes_iniciais,
+        proporcao_novos_clientes=opcoes.novos_clientes,
+        fracao_contas_quentes=opcoes.contas_quentes,
+        peso_contas_quentes=opcoes.peso_quentes,
+        fracao_estouradores=opcoes.estouradores,
+        probabilidade_dia_rajada=opcoes.dias_rajada,
+        fator_rajada=opcoes.fator_rajada,
+    )
+
+
+def carga_sintetica_cli(opcoes):
+    saida = open(opcoes.saida, "w", encoding="utf-8") if opcoes.saida else sys.stdout
+    try:
+        for registro in _carga_das_opcoes(opcoes):
+            saida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+
+
+def reproduzir_cli(opcoes):
+    from .armazenamento import abrir_armazenamento
+    from .desempenho import reproduzir_carga
+    from .servicos import ler_lote
+
+    registros = ler_lote(opcoes.arquivo, "jsonl") if opcoes.arquivo else _carga_das_opcoes(opcoes)
+    armazenamento = abrir_armazenamento(opcoes.armazenamento, opcoes.banco) if opcoes.persistir else None
+    clientes, contas = armazenamento.carregar() if armazenamento is not None else (None, None)
+    try:
+        resultado = reproduzir_carga(
+            registros,
+            clientes,
+            contas,
+            opcoes.taxa,
+            armazenamento,
+            registrar_log=not opcoes.sem_log,
+            relogio_simulado=not opcoes.relogio_real,
+        )
+    finally:
+        if armazenamento is not None:
+            armazenamento.fechar()
+        log.LOG_TRANSACOES.fechar()
+
+    json.dump(resultado, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+
+
+def _adicionar_argumentos_carga(parser):
+    parser.add_argument("--eventos", type=int, default=10000)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--dias", type=int, default=7)
+    parser.add_argument("--clientes-iniciais", type=int, default=100)
+    parser.add_argument("--novos-clientes", type=float, default=0.05, help="fração dos eventos que abre cliente e conta")
+    parser.add_argument("--contas-quentes", type=float, default=0.01, help="fração dos clientes com conta quente")
+    parser.add_argument("--peso-quentes", type=float, default=0.3, help="fração das operações nas contas quentes")
+    parser.add_argument("--estouradores", type=float, default=0.05, help="fração dos clientes que forçam os limites")
+    parser.add_argument("--dias-rajada", type=float, default=0.2, help="probabilidade de um dia ser de rajada")
+    parser.add_argument("--fator-rajada", type=float, default=5.0, help="volume relativo dos dias de rajada")
+
+
+def servidor_cli(opcoes):
+    import asyncio
+
+    from .armazenamento import abrir_armazenamento
+    from .servidor import ServidorFinanSys
+
+    armazenamento = abrir_armazenamento(opcoes.armazenamento, opcoes.banco)
+    clientes, contas = armazenamento.carregar()
+    servidor = ServidorFinanSys(clientes, contas, armazenamento, opcoes.trabalhadores)
+    try:
+        asyncio.run(servidor.servir(opcoes.host, opcoes.porta, opcoes.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        armazenamento.fechar()
+        log.LOG_TRANSACOES.fechar()
+
+
+def carga_cli(opcoes):
+    import asyncio
+
+    from .servidor import gerar_carga
+
+    resultado = asyncio.run(
+        gerar_carga(
+            opcoes.host, opcoes.porta, opcoes.conexoes, opcoes.requisicoes, opcoes.janela, opcoes.contas
+        )
+    )
+    json.dump(resultado, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(prog="FinanSys", description="Sistema bancário FinanSys.")
+    parser.add_argument(
+        "--formato-log",
+        choices=ArquivoLog.FORMATOS,
+        default="texto",
+        help="formato das entradas gravadas em log.txt",
+    )
+    parser.add_argument(
+        "--armazenamento",
+        choices=("sqlite", "diario"),
+        default="sqlite",
+        help="banco SQLite ou diário append-only com snapshots",
+    )
+    parser.add_argument(
+        "--banco",
+        help="arquivo SQLite (padrão finansys.db, ':memory:' para não persistir)"
+        " ou prefixo dos arquivos do diário (padrão finansys)",
+    )
+    parser.add_argument(
+        "--metricas",
+        type=Path,
+        help="habilita as métricas e grava um instantâneo JSON periódico neste arquivo",
+    )
+    parser.add_argument(
+        "--intervalo-metricas", type=float, default=10.0, help="segundos entre instantâneos das métricas"
+    )
+    parser.add_argument(
+        "--perfil",
+        type=Path,
+        help="arquivo JSON lines com os perfis das operações (padrão perfil.jsonl quando o perfil está ativo)",
+    )
+    parser.add_argument(
+        "--perfil-taxa", type=float, default=0.0, help="fração das chamadas perfiladas com cProfile"
+    )
+    parser.add_argument(
+        "--perfil-lento",
+        type=float,
+        help="registra chamadas a partir destes milissegundos e perfila a próxima chamada da mesma operação",
+    )
+    parser.add_argument(
+        "--perfil-alocacoes", action="store_true", help="mede as alocações das chamadas amostradas com tracemalloc"
+    )
+    comandos = parser.add_subparsers(dest="comando")
+
+    consulta = comandos.add_parser("consultar-log", help="filtra entradas do log.txt e dos segmentos rotacionados")
+    consulta.add_argument("--log", type=Path, default=ROOT_PATH / "log.txt", help="arquivo de log")
+    consulta.add_argument("--inicio", type=_data_hora_argumento, help="data/hora inicial (ISO)")
+    consulta.add_argument("--fim", type=_data_hora_argumento, help="data/hora final (ISO)")
+    consulta.add_argument("--funcao", help="nome da função registrada")
+    consulta.add_argument("--cpf", help="CPF do cliente (somente no formato jsonl)")
+    consulta.set_defaults(executar=consultar_log_cli)
+
+    relatorio = comandos.add_parser("relatorio", help="gera os relatórios agregados de todas as contas")
+    relatorio.add_argument("--trabalhadores", type=int, default=os.cpu_count() or 1, help="processos paralelos")
+    relatorio.add_argument(
+        "--tamanho-fatia", type=int, help="contas por tarefa (padrão 1000)"
+    )
+    relatorio.add_argument("--top", type=int, default=10, help="quantidade de contas no ranking por volume")
+    relatorio.set_defaults(executar=relatorio_cli)
+
+    lote = comandos.add_parser("lote", help="aplica clientes, contas, depósitos e saques de um arquivo")
+    lote.add_argument("arquivo", type=Path, help="arquivo CSV ou JSON lines")
+    lote.add_argument("--formato", choices=("csv", "jsonl"), help="padrão: deduzido pela extensão")
+    lote.add_argument("--saida", type=Path, help="arquivo JSON lines com o resultado de cada linha")
+    lote.set_defaults(executar=lote_cli)
+
+    servidor = comandos.add_parser("servidor", help="atende requisições JSON lines via TCP ou socket Unix")
+    servidor.add_argument("--host", default="127.0.0.1")
+    servidor.add_argument("--porta", type=int, default=8765)
+    servidor.add_argument("--unix", help="caminho de socket Unix (substitui host/porta)")
+    servidor.add_argument("--trabalhadores", type=int, help="threads para as operações bancárias")
+    servidor.set_defaults(executar=servidor_cli)
+
+    carga = comandos.add_parser("carga", help="gera carga assíncrona contra o servidor e mede a latência")
+    carga.add_argument("--host", default="127.0.0.1")
+    carga.add_argument("--porta", type=int, default=8765)
+    carga.add_argument("--conexoes", type=int, default=10)
+    carga.add_argument("--requisicoes", type=int, default=1000, help="requisições por conexão")
+    carga.add_argument("--janela", type=int, default=32, help="requisições em voo por conexão")
+    carga.add_argument(
+        "--contas", type=int, help="contas por conexão (padrão: uma a cada quatro requisições)"
+    )
+    carga.set_defaults(executar=carga_cli)
+
+    memoria = comandos.add_parser("memoria", help="mede os bytes por conta e por transação com tracemalloc")
+    memoria.add_argument("--contas", type=int, default=10000)
+    memoria.add_argument("--transacoes", type=int, default=10, help="transações por conta")
+    memoria.set_defaults(executar=memoria_cli)
+
+    benchmark = comandos.add_parser(
+        "benchmark", help="cronometra os caminhos críticos num banco sintético e grava o resultado em JSON"
+    )
+    benchmark.add_argument("--clientes", type=int, default=1000)
+    benchmark.add_argument("--contas-por-cliente", type=int, default=1)
+    benchmark.add_argument("--transacoes", type=int, default=20, help="transações históricas por conta")
+    benchmark.add_argument("--semente", type=int, default=0)
+    benchmark.add_argument("--saida", type=Path, help="arquivo JSON (padrão: saída padrão)")
+    benchmark.add_argument("--sem-memoria", action="store_true", help="não executa a medição de memória")
+    benchmark.set_defaults(executar=benchmark_cli)
+
+    carga_sintetica = comandos.add_parser(
+        "carga-sintetica", help="gera uma carga sintética reprodutível em JSON lines"
+    )
+    _adicionar_argumentos_carga(carga_sintetica)
+    carga_sintetica.add_argument("--saida", type=Path, help="arquivo JSON lines (padrão: saída padrão)")
+    carga_sintetica.set_defaults(executar=carga_sintetica_cli)
+
+    reproduzir = comandos.add_parser(
+        "reproduzir", help="reproduz uma carga sintética a uma taxa alvo e mede vazão e latência"
+    )
+    _adicionar_argumentos_carga(reproduzir)
+    reproduzir.add_argument("--arquivo", type=Path, help="carga gerada por carga-sintetica (padrão: gera na hora)")
+    reproduzir.add_argument("--taxa", type=float, help="registros por segundo (padrão: sem limite)")
+    reproduzir.add_argument("--persistir", action="store_true", help="aplica a carga sobre o armazenamento configurado")
+    reproduzir.add_argument("--sem-log", action="store_true", help="não registra as operações no log")
+    reproduzir.add_argument(
+        "--relogio-real", action="store_true", help="usa o relógio do sistema em vez do instante de cada registro"
+    )
+    reproduzir.set_defaults(executar=reproduzir_cli)
+
+    return parser
+
+
+def executar(argv=None):
+    opcoes = criar_parser().parse_args(argv)
+    if opcoes.formato_log != "texto":
+        configurar_log(formato=opcoes.formato_log)
+    if opcoes.metricas:
+        configurar_metricas(caminho=opcoes.metricas, intervalo=opcoes.intervalo_metricas)
+    if opcoes.perfil or opcoes.perfil_taxa or opcoes.perfil_lento is not None:
+        from .perfil import configurar_perfil
+
+        configurar_perfil(
+            caminho=opcoes.perfil,
+            taxa=opcoes.perfil_taxa or (1.0 if opcoes.perfil_lento is None else 0.0),
+            limite_lento=None if opcoes.perfil_lento is None else opcoes.perfil_lento / 1000,
+            alocacoes=opcoes.perfil_alocacoes,
+        )
+
+    if opcoes.comando is None:
+        from .armazenamento import abrir_armazenamento
+        from .interativo import main
+
+        main(abrir_armazenamento(opcoes.armazenamento, opcoes.banco))
+    else:
+        opcoes.executar(opcoes)
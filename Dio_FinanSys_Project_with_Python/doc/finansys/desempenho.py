@@ -0,0 +1,402 @@
+import itertools
+import os
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+from array import array
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from . import log
+from .log import ArquivoLog, anotar_log, log_transacao
+from .metricas import ler_metricas, percentil
+from .modelo import (
+    _AVISOS,
+    CODIGOS_TRANSACAO,
+    LIMITE_SAQUE_PADRAO,
+    TAMANHO_PAGINA_EXTRATO,
+    Cliente,
+    ContaCorrente,
+    Deposito,
+    Historico,
+    PessoaFisica,
+    RegistroClientes,
+    Saque,
+    configurar_relogio,
+    filtrar_cliente,
+)
+from .servicos import _aplicar_com_motivo, paginar_extrato, registrar_requisicao
+
+
+def _memoria_alocada():
+    return tracemalloc.get_traced_memory()[0]
+
+
+def medir_memoria(quantidade_contas=10000, transacoes_por_conta=10):
+    tracemalloc.start()
+    try:
+        inicio = _memoria_alocada()
+        clientes = [
+            PessoaFisica(nome="Cliente", data_nascimento="01-01-1990", cpf=f"{indice:011d}", endereco="Rua")
+            for indice in range(quantidade_contas)
+        ]
+        contas = []
+        for numero, cliente in enumerate(clientes, start=1):
+            conta = ContaCorrente.nova_conta(cliente=cliente, numero=numero)
+            cliente.adicionar_conta(conta)
+            contas.append(conta)
+        apos_contas = _memoria_alocada()
+
+        data = datetime.now().replace(microsecond=0).timestamp() - transacoes_por_conta * 86400
+        for conta in contas:
+            for indice in range(transacoes_por_conta):
+                conta.historico.anexar(indice % 2, 100, data + indice * 86400)
+        apos_historicos = _memoria_alocada()
+
+        quantidade_transacoes = quantidade_contas * transacoes_por_conta
+        transacoes = [Deposito(100) for _ in range(quantidade_transacoes)]
+        apos_transacoes = _memoria_alocada()
+        del transacoes
+
+        antes_registros = _memoria_alocada()
+        registros = [conta.historico.transacoes for conta in contas]
+        apos_registros = _memoria_alocada()
+        del registros
+    finally:
+        tracemalloc.stop()
+
+    def por_unidade(total, quantidade):
+        return total / quantidade if quantidade else None
+
+    return {
+        "contas": quantidade_contas,
+        "transacoes_por_conta": transacoes_por_conta,
+        "bytes_por_conta": por_unidade(apos_contas - inicio, quantidade_contas),
+        "bytes_por_transacao_no_historico": por_unidade(apos_historicos - apos_contas, quantidade_transacoes),
+        "bytes_por_objeto_transacao": por_unidade(apos_transacoes - apos_historicos, quantidade_transacoes),
+        "bytes_por_registro_materializado": por_unidade(apos_registros - antes_registros, quantidade_transacoes),
+    }
+
+
+def gerar_banco_sintetico(quantidade_clientes, contas_por_cliente=1, transacoes_por_conta=10, semente=0, dias=90):
+    aleatorio = random.Random(semente)
+    meia_noite = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+    primeira_data = meia_noite - dias * 86400
+    clientes = []
+    contas = []
+
+    for indice in range(quantidade_clientes):
+        cliente = PessoaFisica(
+            nome=f"Cliente {indice}",
+            data_nascimento="01-01-1990",
+            cpf=f"{indice:011d}",
+            endereco="Endereço sintético",
+        )
+        for _ in range(contas_por_cliente):
+            conta = ContaCorrente.nova_conta(cliente=cliente, numero=len(contas) + 1)
+            tipos = array("B")
+            valores = array("q")
+            datas = array(
+                "d",
+                sorted(
+                    float(aleatorio.randrange(int(primeira_data), int(meia_noite)))
+                    for _ in range(transacoes_por_conta)
+                ),
+            )
+            saldo = 0
+            for _ in datas:
+                valor = aleatorio.randint(100, 100000)
+                if valor <= saldo and aleatorio.random() < 0.4:
+                    tipos.append(CODIGOS_TRANSACAO["Saque"])
+                    saldo -= valor
+                else:
+                    tipos.append(CODIGOS_TRANSACAO["Deposito"])
+                    saldo += valor
+                valores.append(valor)
+
+            conta.historico.carregar(tipos, valores, datas)
+            conta._saldo = saldo
+            cliente.adicionar_conta(conta)
+            contas.append(conta)
+        clientes.append(cliente)
+
+    return RegistroClientes(clientes), contas
+
+
+def _cronometrar(funcao, argumentos):
+    latencias = array("d")
+    contador = time.perf_counter
+    inicio_total = contador()
+    for argumento in argumentos:
+        inicio = contador()
+        funcao(*argumento)
+        latencias.append(contador() - inicio)
+    total = contador() - inicio_total
+
+    ordenadas = sorted(latencias)
+    return {
+        "operacoes": len(latencias),
+        "total_s": total,
+        "ops_por_s": len(latencias) / total if total else None,
+        "media_us": sum(latencias) / len(latencias) * 1e6 if latencias else None,
+        "p50_us": percentil(ordenadas, 50) * 1e6 if ordenadas else None,
+        "p95_us": percentil(ordenadas, 95) * 1e6 if ordenadas else None,
+        "p99_us": percentil(ordenadas, 99) * 1e6 if ordenadas else None,
+        "max_us": ordenadas[-1] * 1e6 if ordenadas else None,
+    }
+
+
+def _operacao_registrada(conta, valor):
+    anotar_log(conta=conta.numero)
+    return True
+
+
+def executar_benchmark(
+    quantidade_clientes=1000,
+    contas_por_cliente=1,
+    transacoes_por_conta=20,
+    semente=0,
+    formato_log="texto",
+    medir_memoria_contas=True,
+):
+    inicio = time.perf_counter()
+    clientes, contas = gerar_banco_sintetico(quantidade_clientes, contas_por_cliente, transacoes_por_conta, semente)
+    geracao = time.perf_counter() - inicio
+
+    aleatorio = random.Random(semente)
+    cpfs = [cliente.cpf for cliente in clientes]
+    consultas = [(aleatorio.choice(cpfs), clientes) for _ in range(len(contas))]
+    consultas += [(f"9{indice:010d}", clientes) for indice in range(len(contas) // 10)]
+    aleatorio.shuffle(consultas)
+
+    caminhos = {}
+    token = _AVISOS.set([])
+    try:
+        caminhos["ContaCorrente.sacar"] = _cronometrar(
+            ContaCorrente.sacar, [(conta, aleatorio.randint(100, 60000)) for conta in contas]
+        )
+        caminhos["Cliente.realizar_transacao"] = _cronometrar(
+            Cliente.realizar_transacao,
+            [
+                (conta.cliente, conta, transacao)
+                for conta in contas
+                for transacao in (Deposito(aleatorio.randint(100, 100000)), Saque(aleatorio.randint(100, 10000)))
+            ],
+        )
+    finally:
+        _AVISOS.reset(token)
+
+    caminhos["Historico.transacoes_do_dia"] = _cronometrar(
+        Historico.transacoes_do_dia, [(conta.historico,) for conta in contas]
+    )
+    caminhos["filtrar_cliente"] = _cronometrar(filtrar_cliente, consultas)
+
+    log_original = log.LOG_TRANSACOES
+    with tempfile.TemporaryDirectory() as pasta:
+        log.LOG_TRANSACOES = ArquivoLog(Path(pasta) / "log.txt", formato=formato_log)
+        try:
+            caminhos["log_transacao"] = _cronometrar(
+                log_transacao(_operacao_registrada), [(conta, 100) for conta in contas]
+            )
+            inicio = time.perf_counter()
+            log.LOG_TRANSACOES.fechar()
+            caminhos["log_transacao"]["fechamento_s"] = time.perf_counter() - inicio
+        finally:
+            log.LOG_TRANSACOES.fechar()
+            log.LOG_TRANSACOES = log_original
+
+    resultado = {
+        "parametros": {
+            "clientes": quantidade_clientes,
+            "contas_por_cliente": contas_por_cliente,
+            "transacoes_por_conta": transacoes_por_conta,
+            "semente": semente,
+            "formato_log": formato_log,
+        },
+        "ambiente": {
+            "python": platform.python_version(),
+            "implementacao": platform.python_implementation(),
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "geracao_banco_s": geracao,
+        "caminhos": caminhos,
+    }
+    if medir_memoria_contas:
+        resultado["memoria"] = medir_memoria(len(contas), transacoes_por_conta)
+    return resultado
+
+
+PROPORCOES_CARGA = {"deposito": 0.45, "saque": 0.35, "extrato": 0.2}
+
+
+def gerar_carga_sintetica(
+    eventos=10000,
+    semente=0,
+    dias=7,
+    clientes_iniciais=100,
+    proporcao_novos_clientes=0.05,
+    fracao_contas_quentes=0.01,
+    peso_contas_quentes=0.3,
+    fracao_estouradores=0.05,
+    probabilidade_dia_rajada=0.2,
+    fator_rajada=5.0,
+    proporcoes=None,
+):
+    aleatorio = random.Random(semente)
+    proporcoes = proporcoes or PROPORCOES_CARGA
+    operacoes = list(proporcoes)
+    pesos_operacoes = [proporcoes[operacao] for operacao in operacoes]
+    limite_reais = LIMITE_SAQUE_PADRAO / 100
+
+    pesos_dias = [fator_rajada if aleatorio.random() < probabilidade_dia_rajada else 1.0 for _ in range(dias)]
+    eventos_por_dia = [0] * dias
+    for dia in aleatorio.choices(range(dias), weights=pesos_dias, k=eventos):
+        eventos_por_dia[dia] += 1
+
+    cpfs = []
+    quentes = []
+    estouradores = set()
+
+    def novo_cliente(instante, dia):
+        cpf = f"7{len(cpfs):010d}"
+        cpfs.append(cpf)
+        if aleatorio.random() < fracao_contas_quentes:
+            quentes.append(cpf)
+        if aleatorio.random() < fracao_estouradores:
+            estouradores.add(cpf)
+        yield {"operacao": "cliente", "cpf": cpf, "nome": f"Cliente {cpf}", "dia": dia, "instante": instante}
+        yield {"operacao": "conta", "cpf": cpf, "dia": dia, "instante": instante}
+
+    for _ in range(clientes_iniciais):
+        yield from novo_cliente(0.0, 0)
+
+    for dia, quantidade in enumerate(eventos_por_dia):
+        instantes = sorted(aleatorio.uniform(dia, dia + 1) * 86400 for _ in range(quantidade))
+        for instante in instantes:
+            if not cpfs or aleatorio.random() < proporcao_novos_clientes:
+                yield from novo_cliente(instante, dia)
+                continue
+
+            if quentes and aleatorio.random() < peso_contas_quentes:
+                cpf = aleatorio.choice(quentes)
+            else:
+                cpf = aleatorio.choice(cpfs)
+
+            if cpf in estouradores and aleatorio.random() < 0.7:
+                operacao = "saque"
+                valor = aleatorio.uniform(limite_reais, limite_reais * 2)
+            else:
+                operacao = aleatorio.choices(operacoes, weights=pesos_operacoes)[0]
+                valor = aleatorio.lognormvariate(5 if operacao == "deposito" else 4, 1)
+
+            registro = {"operacao": operacao, "cpf": cpf, "dia": dia, "instante": instante}
+            if operacao != "extrato":
+                registro["valor"] = f"{valor:.2f}"
+            yield registro
+
+
+def _extrato_da_carga(registro, clientes):
+    cliente = filtrar_cliente(registro.get("cpf", ""), clientes)
+    if not cliente or not cliente.contas:
+        return False, "Cliente ou conta não encontrado!"
+
+    paginar_extrato(cliente.contas[0], registro.get("tamanho_pagina", TAMANHO_PAGINA_EXTRATO))
+    return True, None
+
+
+def _resumir_latencias(latencias):
+    ordenadas = sorted(latencias)
+    if not ordenadas:
+        return {"latencia_p50_ms": None, "latencia_p95_ms": None, "latencia_p99_ms": None, "latencia_max_ms": None}
+    return {
+        "latencia_p50_ms": percentil(ordenadas, 50) * 1000,
+        "latencia_p95_ms": percentil(ordenadas, 95) * 1000,
+        "latencia_p99_ms": percentil(ordenadas, 99) * 1000,
+        "latencia_max_ms": ordenadas[-1] * 1000,
+    }
+
+
+def reproduzir_carga(
+    registros, clientes=None, contas=None, taxa=None, armazenamento=None, registrar_log=True, relogio_simulado=True
+):
+    registros = list(registros)
+    clientes = RegistroClientes() if clientes is None else clientes
+    contas = [] if contas is None else contas
+
+    instante_inicial = None
+    if relogio_simulado:
+        ultimo_instante = max((registro["instante"] for registro in registros if "instante" in registro), default=None)
+        if ultimo_instante is not None:
+            meia_noite = datetime.combine(datetime.now().date(), datetime.min.time())
+            instante_inicial = (meia_noite - timedelta(days=int(ultimo_instante // 86400))).timestamp()
+    agora = [time.time()]
+
+    agenda = None
+    if taxa:
+        instantes = [registro.get("instante") for registro in registros]
+        if registros and None not in instantes and instantes[-1] > instantes[0]:
+            escala = len(registros) / taxa / (instantes[-1] - instantes[0])
+            agenda = [(instante - instantes[0]) * escala for instante in instantes]
+        else:
+            agenda = [indice / taxa for indice in range(len(registros))]
+
+    latencias = {}
+    resultados = {}
+    motivos = {}
+    contador = time.perf_counter
+    if instante_inicial is not None:
+        configurar_relogio(lambda: agora[0])
+    inicio = contador()
+    try:
+        for indice, registro in enumerate(registros):
+            operacao = registro.get("operacao")
+            if instante_inicial is not None and "instante" in registro:
+                agora[0] = instante_inicial + registro["instante"]
+            referencia = contador()
+            if agenda is not None:
+                previsto = inicio + agenda[indice]
+                if previsto > referencia:
+                    time.sleep(previsto - referencia)
+                referencia = previsto
+
+            if operacao == "extrato":
+                sucesso, motivo = _extrato_da_carga(registro, clientes)
+            else:
+                sucesso, motivo = _aplicar_com_motivo(registro, clientes, contas, armazenamento)
+                if registrar_log:
+                    registrar_requisicao(registro, sucesso)
+
+            latencias.setdefault(operacao, array("d")).append(contador() - referencia)
+            contagem = resultados.setdefault(operacao, [0, 0])
+            contagem[0 if sucesso else 1] += 1
+            if not sucesso:
+                motivos[motivo] = motivos.get(motivo, 0) + 1
+    finally:
+        if instante_inicial is not None:
+            configurar_relogio()
+    duracao = contador() - inicio
+
+    sucessos = sum(sucessos for sucessos, _ in resultados.values())
+    return {
+        "registros": len(registros),
+        "duracao_s": duracao,
+        "taxa_alvo_rps": taxa,
+        "vazao_rps": len(registros) / duracao if duracao else None,
+        "sucessos": sucessos,
+        "falhas": len(registros) - sucessos,
+        **_resumir_latencias(itertools.chain.from_iterable(latencias.values())),
+        "operacoes": {
+            operacao: {
+                "quantidade": sum(resultados[operacao]),
+                "sucessos": resultados[operacao][0],
+                "falhas": resultados[operacao][1],
+                **_resumir_latencias(latencias[operacao]),
+            }
+            for operacao in latencias
+        },
+        "motivos_falha": dict(sorted(motivos.items(), key=lambda item: item[1], reverse=True)),
+        "metricas": ler_metricas(),
+    }
@@ -0,0 +1,251 @@
+import textwrap
+
+from . import log
+from .log import anotar_log, ler_entrada, log_transacao
+from .modelo import (
+    TAMANHO_PAGINA_EXTRATO,
+    ContaCorrente,
+    ContaIterador,
+    Deposito,
+    PessoaFisica,
+    RegistroClientes,
+    Saque,
+    Transferencia,
+    filtrar_cliente,
+    formatar_valor,
+    para_centavos,
+)
+from .servicos import paginar_extrato
+
+
+def menu():
+    menu = """\n
+    ================ MENU ================
+    [d]\tDepositar
+    [s]\tSacar
+    [t]\tTransferir
+    [e]\tExtrato
+    [nc]\tNova conta
+    [lc]\tListar contas
+    [nu]\tNovo usuário
+    [q]\tSair
+    => """
+
+    return input(textwrap.dedent(menu))
+
+
+def recuperar_conta_cliente(cliente):
+    if not cliente:
+        print("\n@@@ Cliente não encontrado! @@@")
+
+        return None
+
+    if not cliente.contas:
+        print("\n@@@ Cliente não possui conta! @@@")
+        return None
+
+    return cliente.contas[0]
+
+
+@log_transacao
+def depositar(clientes):
+    cpf = ler_entrada("Informe o CPF do cliente: ")
+    anotar_log(cpf=cpf)
+    cliente = filtrar_cliente(cpf, clientes)
+
+    if not cliente:
+        print("\n@@@ Cliente não encontrado! @@@")
+        return
+
+    valor = para_centavos(ler_entrada("Informe o valor do depósito: "))
+    transacao = Deposito(valor)
+    anotar_log(valor=valor)
+
+    conta = recuperar_conta_cliente(cliente)
+    if not conta:
+        return
+
+    anotar_log(conta=conta.numero)
+    anotar_log(resultado=cliente.realizar_transacao(conta, transacao))
+
+
+@log_transacao
+def sacar(clientes):
+    cpf = ler_entrada("Informe o CPF do cliente: ")
+    anotar_log(cpf=cpf)
+    cliente = filtrar_cliente(cpf, clientes)
+
+    if not cliente:
+        print("\n@@@ Cliente não encontrado! @@@")
+        return
+
+    valor = para_centavos(ler_entrada("Informe o valor do saque: "))
+    transacao = Saque(valor)
+    anotar_log(valor=valor)
+
+    conta = recuperar_conta_cliente(cliente)
+    if not conta:
+        return
+
+    anotar_log(conta=conta.numero)
+    anotar_log(resultado=cliente.realizar_transacao(conta, transacao))
+
+
+@log_transacao
+def transferir(clientes):
+    cpf = ler_entrada("Informe o CPF do cliente: ")
+    anotar_log(cpf=cpf)
+    cliente = filtrar_cliente(cpf, clientes)
+
+    if not cliente:
+        print("\n@@@ Cliente não encontrado! @@@")
+        return
+
+    conta = recuperar_conta_cliente(cliente)
+    if not conta:
+        return
+
+    cpf_destino = ler_entrada("Informe o CPF do cliente de destino: ")
+    destino = recuperar_conta_cliente(filtrar_cliente(cpf_destino, clientes))
+    if not destino:
+        return
+
+    valor = para_centavos(ler_entrada("Informe o valor da transferência: "))
+    anotar_log(conta=conta.numero, valor=valor)
+    anotar_log(resultado=cliente.realizar_transacao(conta, Transferencia(valor, destino)))
+
+
+@log_transacao
+def exibir_extrato(clientes, tamanho_pagina=TAMANHO_PAGINA_EXTRATO, inicio=None, fim=None):
+
+    cpf = ler_entrada("Informe o CPF do cliente: ")
+    anotar_log(cpf=cpf)
+    cliente = filtrar_cliente(cpf, clientes)
+
+    if not cliente:
+        print("\n@@@ Cliente não encontrado! @@@")
+        return
+
+    conta = recuperar_conta_cliente(cliente)
+    if not conta:
+        return
+
+    anotar_log(conta=conta.numero)
+    print("\n================ EXTRATO ================")
+
+    cursor = 0
+    while cursor is not None:
+        linhas, cursor = paginar_extrato(conta, tamanho_pagina, cursor, inicio, fim)
+        for linha in linhas:
+            print(linha)
+
+        if cursor is not None and ler_entrada("\n[Enter] próxima página, [q] encerrar extrato: ") == "q":
+            break
+
+    print(f"\nSaldo:\n\tR$ {formatar_valor(conta.saldo)}")
+    print("==========================================")
+
+
+@log_transacao
+def criar_cliente(clientes):
+    cpf = ler_entrada("Informe o CPF (somente número): ")
+    anotar_log(cpf=cpf)
+    cliente = filtrar_cliente(cpf, clientes)
+
+    if cliente:
+        print("\n@@@ Já existe cliente com esse CPF! @@@")
+        return
+
+    nome = ler_entrada("Informe o nome completo: ")
+    data_nascimento = ler_entrada("Informe a data de nascimento (dd-mm-aaaa): ")
+    endereco = ler_entrada(
+        "Informe o endereço (logradouro, nro - bairro - cidade/sigla estado): "
+    )
+
+    cliente = PessoaFisica(
+        nome=nome, data_nascimento=data_nascimento, cpf=cpf, endereco=endereco
+    )
+
+    if not clientes.adicionar(cliente):
+        print("\n@@@ Já existe cliente com esse CPF! @@@")
+        return
+
+    anotar_log(resultado=True)
+    print("\n=== Cliente criado com sucesso! ===")
+
+
+@log_transacao
+def criar_conta(numero_conta, clientes, contas):
+    cpf = ler_entrada("Informe o CPF do cliente: ")
+    anotar_log(cpf=cpf, conta=numero_conta)
+    cliente = filtrar_cliente(cpf, clientes)
+
+    if not cliente:
+        print("\n@@@ Cliente não encontrado, fluxo de criação de conta encerrado! @@@")
+        return
+
+    conta = ContaCorrente.nova_conta(cliente=cliente, numero=numero_conta)
+    contas.append(conta)
+    cliente.contas.append(conta)
+
+    anotar_log(resultado=True)
+    print("\n=== Conta criada com sucesso! ===")
+
+
+def listar_contas(contas):
+    iterador = ContaIterador(contas)
+    for conta in iterador:
+        print("=" * 100)
+        print(textwrap.dedent(str(conta)))
+
+
+def main(armazenamento=None):
+    if armazenamento is None:
+        clientes = RegistroClientes()
+        contas = []
+    else:
+        clientes, contas = armazenamento.carregar()
+
+    while True:
+        opcao = menu()
+
+        if opcao == "d":
+            depositar(clientes)
+
+        elif opcao == "s":
+            sacar(clientes)
+
+        elif opcao == "t":
+            transferir(clientes)
+
+        elif opcao == "e":
+            exibir_extrato(clientes)
+
+        elif opcao == "nu":
+            total_clientes = len(clientes)
+            criar_cliente(clientes)
+
+            if armazenamento is not None and len(clientes) > total_clientes:
+                armazenamento.salvar_cliente(clientes[-1])
+
+        elif opcao == "nc":
+            numero_conta = len(contas) + 1
+
+            criar_conta(numero_conta, clientes, contas)
+
+            if armazenamento is not None and len(contas) == numero_conta:
+                armazenamento.salvar_conta(contas[-1])
+
+        elif opcao == "lc":
+            listar_contas(contas)
+
+        elif opcao == "q":
+            if armazenamento is not None:
+                armazenamento.fechar()
+            log.LOG_TRANSACOES.fechar()
+            break
+
+        else:
+            print(
+                "\n@@@ Operação inválida, por favor selecione novamente a operação desejada. @@@"
+            )
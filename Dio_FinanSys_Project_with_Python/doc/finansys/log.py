@@ -0,0 +1,487 @@
+import atexit
+import contextvars
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from . import metricas
+from .modelo import ROOT_PATH, normalizar_cpf
+
+
+class ArquivoLog:
+    DURABILIDADES = (None, "lote", "entrada")
+    POLITICAS_FILA_CHEIA = ("bloquear", "descartar", "contar")
+    FORMATOS = ("texto", "jsonl")
+
+    def __init__(
+        self,
+        caminho,
+        tamanho_lote=100,
+        intervalo=1.0,
+        durabilidade=None,
+        assincrono=False,
+        tamanho_fila=10000,
+        politica_fila_cheia="bloquear",
+        tamanho_maximo=None,
+        rotacao_diaria=False,
+        segmentos_retidos=7,
+        formato="texto",
+    ):
+        if durabilidade not in self.DURABILIDADES:
+            raise ValueError(f"Durabilidade inválida: {durabilidade!r}")
+        if politica_fila_cheia not in self.POLITICAS_FILA_CHEIA:
+            raise ValueError(f"Política de fila cheia inválida: {politica_fila_cheia!r}")
+        if formato not in self.FORMATOS:
+            raise ValueError(f"Formato de log inválido: {formato!r}")
+
+        self._caminho = Path(caminho)
+        self._formato = formato
+        self._tamanho_lote = tamanho_lote
+        self._intervalo = intervalo
+        self._durabilidade = durabilidade
+        self._arquivo = None
+        self._pendentes = []
+        self._pendentes_inicio = None
+        self._pendentes_fim = None
+        self._trava = threading.Lock()
+        self._parar = threading.Event()
+        self._temporizador = None
+
+        self._tamanho_maximo = tamanho_maximo
+        self._rotacao_diaria = rotacao_diaria
+        self._segmentos_retidos = segmentos_retidos
+        self._inicio_segmento = None
+        self._fim_segmento = None
+        self._entradas_segmento = 0
+        self._bytes_segmento = 0
+
+        self._politica_fila_cheia = politica_fila_cheia
+        self._descartados = 0
+        self._descartados_informados = 0
+        self._fila = None
+        self._escritor = None
+        if assincrono:
+            self._fila = queue.Queue(maxsize=tamanho_fila)
+            self._escritor = threading.Thread(
+                target=self._consumir_fila, name="ArquivoLog-escritor", daemon=True
+            )
+            self._escritor.start()
+
+        atexit.register(self.fechar)
+
+    @property
+    def caminho(self):
+        return self._caminho
+
+    @property
+    def descartados(self):
+        return self._descartados
+
+    @property
+    def pendentes(self):
+        return len(self._pendentes)
+
+    @property
+    def tamanho_fila(self):
+        return 0 if self._fila is None else self._fila.qsize()
+
+    @property
+    def caminho_manifesto(self):
+        return caminho_manifesto(self._caminho)
+
+    def segmentos(self):
+        return ler_manifesto(self._caminho)
+
+    def registrar(self, nome_funcao, args, kwargs, resultado, contexto=None):
+        coletor = metricas.METRICAS
+        if coletor is None:
+            self._registrar(nome_funcao, args, kwargs, resultado, contexto)
+            return
+
+        inicio = time.perf_counter()
+        self._registrar(nome_funcao, args, kwargs, resultado, contexto)
+        coletor.observar("log.registro", time.perf_counter() - inicio)
+
+    def _registrar(self, nome_funcao, args, kwargs, resultado, contexto):
+        registro = (time.time(), nome_funcao, args, kwargs, resultado, contexto or {})
+        if self._fila is None:
+            self.escrever(self._formatar(registro), registro[0])
+            return
+
+        if self._politica_fila_cheia == "bloquear":
+            self._fila.put(registro)
+            return
+
+        try:
+            self._fila.put_nowait(registro)
+        except queue.Full:
+            self._descartados += 1
+
+    def _formatar(self, registro):
+        momento, nome_funcao, args, kwargs, resultado, contexto = registro
+        if self._formato == "jsonl":
+            return json.dumps(
+                {
+                    "timestamp": datetime.fromtimestamp(momento).isoformat(timespec="seconds"),
+                    "funcao": nome_funcao,
+                    "cpf": normalizar_cpf(contexto["cpf"]) if contexto.get("cpf") else None,
+                    "conta": contexto.get("conta"),
+                    "valor": contexto.get("valor"),
+                    "resultado": contexto.get("resultado", resultado),
+                },
+                ensure_ascii=False,
+                separators=(",", ":"),
+                default=repr,
+            ) + "\n"
+
+        data_hora = datetime.fromtimestamp(momento).strftime("%Y-%m-%d %H:%M:%S")
+        return f"[{data_hora}] Função '{nome_funcao}' executada com argumentos {args} e {kwargs}. Retornou {resultado}\n"
+
+    def _consumir_fila(self):
+        while True:
+            registro = self._fila.get()
+            if registro is not None:
+                self.escrever(self._formatar(registro), registro[0])
+
+            if self._politica_fila_cheia == "contar":
+                self._informar_descartados()
+
+            if registro is None:
+                return
+
+    def _informar_descartados(self):
+        perdidos = self._descartados - self._descartados_informados
+        if perdidos:
+            self._descartados_informados += perdidos
+            data_hora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.escrever(f"[{data_hora}] {perdidos} entradas de log descartadas por fila cheia\n")
+
+    def escrever(self, linha, momento=None):
+        if momento is None:
+            momento = time.time()
+
+        with self._trava:
+            self._pendentes.append(linha)
+            if self._pendentes_inicio is None:
+                self._pendentes_inicio = momento
+            self._pendentes_fim = momento
+            if self._durabilidade == "entrada" or len(self._pendentes) >= self._tamanho_lote:
+                self._descarregar()
+            elif self._temporizador is None and self._intervalo:
+                self._iniciar_temporizador()
+
+    def flush(self):
+        with self._trava:
+            self._descarregar()
+
+    def fechar(self):
+        if self._escritor is not None:
+            self._fila.put(None)
+            self._escritor.join()
+            self._escritor = None
+
+        self._parar.set()
+        with self._trava:
+            self._descarregar()
+            if self._arquivo is not None:
+                self._arquivo.close()
+                self._arquivo = None
+
+    def _iniciar_temporizador(self):
+        self._parar.clear()
+        self._temporizador = threading.Thread(
+            target=self._descarregar_periodicamente, name="ArquivoLog", daemon=True
+        )
+        self._temporizador.start()
+
+    def _descarregar_periodicamente(self):
+        while not self._parar.wait(self._intervalo):
+            self.flush()
+        self._temporizador = None
+
+    def _descarregar(self):
+        if not self._pendentes:
+            return
+
+        linhas, self._pendentes = self._pendentes, []
+        inicio, fim = self._pendentes_inicio, self._pendentes_fim
+        self._pendentes_inicio = self._pendentes_fim = None
+        dados = "".join(linhas)
+        tamanho = len(dados.encode("utf-8")) if self._tamanho_maximo else len(dados)
+        comeco_escrita = time.perf_counter()
+        try:
+            if self._arquivo is None:
+                self._abrir()
+
+            if self._precisa_rotacionar(inicio, tamanho):
+                self._rotacionar()
+                self._abrir()
+
+            self._arquivo.write(dados)
+            self._arquivo.flush()
+            if self._durabilidade is not None:
+                os.fsync(self._arquivo.fileno())
+        except PermissionError:
+            print("Erro: Sem permissão para escrever no arquivo de log.")
+            return
+        except Exception as e:
+            print(f"Erro ao escrever no arquivo de log: {e}")
+            return
+
+        coletor = metricas.METRICAS
+        if coletor is not None:
+            coletor.observar("log.escrita", time.perf_counter() - comeco_escrita)
+            coletor.contar("log.entradas_gravadas", len(linhas))
+
+        if self._inicio_segmento is None:
+            self._inicio_segmento = inicio
+        self._fim_segmento = fim
+        self._entradas_segmento += len(linhas)
+        self._bytes_segmento += tamanho
+
+    def _abrir(self):
+        self._arquivo = open(self._caminho, "a", encoding="utf-8")
+        self._bytes_segmento = self._arquivo.tell()
+        if self._bytes_segmento and self._inicio_segmento is None:
+            self._inicio_segmento, self._fim_segmento, self._entradas_segmento = (
+                _resumir_segmento(self._caminho)
+            )
+
+    def _precisa_rotacionar(self, inicio, tamanho):
+        if not self._bytes_segmento:
+            return False
+
+        if self._tamanho_maximo and self._bytes_segmento + tamanho > self._tamanho_maximo:
+            return True
+
+        return (
+            self._rotacao_diaria
+            and datetime.fromtimestamp(self._inicio_segmento).date()
+            != datetime.fromtimestamp(inicio).date()
+        )
+
+    def _rotacionar(self):
+        self._arquivo.close()
+        self._arquivo = None
+
+        segmentos = ler_manifesto(self._caminho)
+        sequencia = segmentos[-1]["sequencia"] + 1 if segmentos else 1
+        carimbo = datetime.fromtimestamp(self._inicio_segmento).strftime("%Y%m%d-%H%M%S")
+        destino = self._caminho.with_name(
+            f"{self._caminho.stem}-{carimbo}-{sequencia:06d}{self._caminho.suffix}.gz"
+        )
+
+        with open(self._caminho, "rb") as origem, gzip.open(destino, "wb") as compactado:
+            shutil.copyfileobj(origem, compactado)
+        os.remove(self._caminho)
+
+        segmentos.append(
+            {
+                "sequencia": sequencia,
+                "arquivo": destino.name,
+                "inicio": datetime.fromtimestamp(self._inicio_segmento).isoformat(timespec="seconds"),
+                "fim": datetime.fromtimestamp(self._fim_segmento).isoformat(timespec="seconds"),
+                "entradas": self._entradas_segmento,
+            }
+        )
+        while self._segmentos_retidos is not None and len(segmentos) > self._segmentos_retidos:
+            antigo = segmentos.pop(0)
+            try:
+                os.remove(self._caminho.with_name(antigo["arquivo"]))
+            except FileNotFoundError:
+                pass
+
+        manifesto = caminho_manifesto(self._caminho)
+        temporario = manifesto.with_name(manifesto.name + ".tmp")
+        temporario.write_text(json.dumps(segmentos, indent=2), encoding="utf-8")
+        os.replace(temporario, manifesto)
+
+        self._inicio_segmento = None
+        self._fim_segmento = None
+        self._entradas_segmento = 0
+        self._bytes_segmento = 0
+
+
+def caminho_manifesto(caminho_log):
+    caminho_log = Path(caminho_log)
+    return caminho_log.with_name(f"{caminho_log.stem}.manifesto.json")
+
+
+def ler_manifesto(caminho_log):
+    try:
+        return json.loads(caminho_manifesto(caminho_log).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return []
+
+
+def _momento_da_linha(linha):
+    try:
+        if linha.startswith("{"):
+            return datetime.fromisoformat(json.loads(linha)["timestamp"]).timestamp()
+        return datetime.strptime(linha[1:20], "%Y-%m-%d %H:%M:%S").timestamp()
+    except (ValueError, KeyError):
+        return None
+
+
+def _interpretar_linha_log(linha):
+    if linha.startswith("{"):
+        try:
+            return json.loads(linha)
+        except ValueError:
+            return None
+
+    momento = _momento_da_linha(linha)
+    if momento is None:
+        return None
+
+    inicio_funcao = linha.find("Função '")
+    funcao = None
+    if inicio_funcao != -1:
+        inicio_funcao += len("Função '")
+        funcao = linha[inicio_funcao:linha.find("'", inicio_funcao)]
+
+    return {
+        "timestamp": datetime.fromtimestamp(momento).isoformat(timespec="seconds"),
+        "funcao": funcao,
+        "texto": linha.rstrip("\n"),
+    }
+
+
+def _abrir_segmento(caminho):
+    if caminho.suffix == ".gz":
+        return gzip.open(caminho, "rt", encoding="utf-8")
+    return open(caminho, encoding="utf-8")
+
+
+def consultar_log(caminho=None, inicio=None, fim=None, funcao=None, cpf=None):
+    caminho = Path(caminho or LOG_TRANSACOES.caminho)
+    inicio_iso = inicio.isoformat(timespec="seconds") if inicio else None
+    fim_iso = fim.isoformat(timespec="seconds") if fim else None
+    chave_cpf = normalizar_cpf(cpf) if cpf is not None else None
+
+    arquivos = [
+        caminho.with_name(segmento["arquivo"])
+        for segmento in ler_manifesto(caminho)
+        if (fim_iso is None or segmento["inicio"] <= fim_iso)
+        and (inicio_iso is None or segmento["fim"] >= inicio_iso)
+    ]
+    arquivos.append(caminho)
+
+    for arquivo in arquivos:
+        try:
+            segmento = _abrir_segmento(arquivo)
+        except FileNotFoundError:
+            continue
+
+        with segmento:
+            for linha in segmento:
+                if funcao is not None and funcao not in linha:
+                    continue
+                if chave_cpf is not None and chave_cpf not in linha:
+                    continue
+
+                entrada = _interpretar_linha_log(linha)
+                if entrada is None:
+                    continue
+                if inicio_iso is not None and entrada["timestamp"] < inicio_iso:
+                    continue
+                if fim_iso is not None and entrada["timestamp"] > fim_iso:
+                    continue
+                if funcao is not None and entrada["funcao"] != funcao:
+                    continue
+                if chave_cpf is not None and normalizar_cpf(entrada.get("cpf") or "") != chave_cpf:
+                    continue
+
+                yield entrada
+
+
+def _resumir_segmento(caminho):
+    inicio = fim = None
+    entradas = 0
+    with open(caminho, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            entradas += 1
+            momento = _momento_da_linha(linha)
+            if momento is not None:
+                if inicio is None:
+                    inicio = momento
+                fim = momento
+
+    if inicio is None:
+        inicio = fim = os.path.getmtime(caminho)
+    return inicio, fim, entradas
+
+
+LOG_TRANSACOES = ArquivoLog(ROOT_PATH / "log.txt")
+
+
+def configurar_log(**opcoes):
+    global LOG_TRANSACOES
+
+    LOG_TRANSACOES.fechar()
+    LOG_TRANSACOES = ArquivoLog(opcoes.pop("caminho", LOG_TRANSACOES.caminho), **opcoes)
+    return LOG_TRANSACOES
+
+
+_CONTEXTO_LOG = contextvars.ContextVar("contexto_log", default=None)
+
+
+def anotar_log(**campos):
+    contexto = _CONTEXTO_LOG.get()
+    if contexto is not None:
+        contexto.update(campos)
+
+
+_ESPERA_ENTRADA = contextvars.ContextVar("espera_entrada", default=None)
+
+
+def ler_entrada(mensagem=""):
+    espera = _ESPERA_ENTRADA.get()
+    if espera is None:
+        return input(mensagem)
+
+    inicio = time.perf_counter()
+    try:
+        return input(mensagem)
+    finally:
+        espera[0] += time.perf_counter() - inicio
+
+
+PERFIL = None
+
+
+def perfilar(func):
+
+    def envelope(*args, **kwargs):
+        perfil = PERFIL
+        if perfil is None:
+            return func(*args, **kwargs)
+        return perfil.executar(func, args, kwargs)
+
+    return envelope
+
+
+def log_transacao(func):
+
+    def envelope(*args, **kwargs):
+        contexto = {}
+        token = _CONTEXTO_LOG.set(contexto)
+        try:
+            perfil = PERFIL
+            if perfil is None:
+                resultado = func(*args, **kwargs)
+            else:
+                resultado = perfil.executar(func, args, kwargs)
+        finally:
+            _CONTEXTO_LOG.reset(token)
+
+        LOG_TRANSACOES.registrar(func.__name__, args, kwargs, resultado, contexto)
+        return resultado
+
+    return envelope
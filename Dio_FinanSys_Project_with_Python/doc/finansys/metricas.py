@@ -0,0 +1,174 @@
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+
+
+LIMITES_LATENCIA = tuple(0.000001 * 2**expoente for expoente in range(25))
+LIMITES_TAMANHO = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+class Histograma:
+    __slots__ = ("_limites", "_faixas", "quantidade", "soma", "minimo", "maximo")
+
+    def __init__(self, limites=LIMITES_LATENCIA):
+        self._limites = limites
+        self._faixas = [0] * (len(limites) + 1)
+        self.quantidade = 0
+        self.soma = 0
+        self.minimo = None
+        self.maximo = None
+
+    def observar(self, valor):
+        self._faixas[bisect_left(self._limites, valor)] += 1
+        self.quantidade += 1
+        self.soma += valor
+        if self.minimo is None or valor < self.minimo:
+            self.minimo = valor
+        if self.maximo is None or valor > self.maximo:
+            self.maximo = valor
+
+    def percentil(self, percentual):
+        if not self.quantidade:
+            return None
+
+        alvo = self.quantidade * percentual / 100
+        acumulado = 0
+        for indice, quantidade in enumerate(self._faixas):
+            acumulado += quantidade
+            if acumulado >= alvo:
+                break
+        return min(self._limites[indice], self.maximo) if indice < len(self._limites) else self.maximo
+
+    def resumo(self):
+        return {
+            "quantidade": self.quantidade,
+            "soma": self.soma,
+            "media": self.soma / self.quantidade if self.quantidade else None,
+            "minimo": self.minimo,
+            "maximo": self.maximo,
+            "p50": self.percentil(50),
+            "p95": self.percentil(95),
+            "p99": self.percentil(99),
+            "faixas": {
+                str(limite): quantidade
+                for limite, quantidade in zip(self._limites + ("inf",), self._faixas)
+                if quantidade
+            },
+        }
+
+
+class Metricas:
+    def __init__(self, caminho=None, intervalo=10.0):
+        self._caminho = Path(caminho) if caminho else None
+        self._intervalo = intervalo
+        self._trava = threading.Lock()
+        self._contadores = {}
+        self._histogramas = {}
+        self._medidores = {}
+        self._inicio = time.time()
+        self._parar = threading.Event()
+        self._exportador = None
+        if self._caminho is not None:
+            self._exportador = threading.Thread(
+                target=self._exportar_periodicamente, name="Metricas", daemon=True
+            )
+            self._exportador.start()
+            atexit.register(self.fechar)
+
+    def contar(self, nome, quantidade=1):
+        with self._trava:
+            self._contadores[nome] = self._contadores.get(nome, 0) + quantidade
+
+    def observar(self, nome, valor, limites=LIMITES_LATENCIA):
+        with self._trava:
+            histograma = self._histogramas.get(nome)
+            if histograma is None:
+                histograma = self._histogramas[nome] = Histograma(limites)
+            histograma.observar(valor)
+
+    def medir(self, nome, funcao):
+        self._medidores[nome] = funcao
+
+    def instantaneo(self):
+        medidores = {}
+        for nome, funcao in list(self._medidores.items()):
+            try:
+                medidores[nome] = funcao()
+            except Exception as erro:
+                medidores[nome] = repr(erro)
+
+        with self._trava:
+            return {
+                "momento": datetime.now().isoformat(timespec="seconds"),
+                "desde": datetime.fromtimestamp(self._inicio).isoformat(timespec="seconds"),
+                "contadores": dict(self._contadores),
+                "medidores": medidores,
+                "histogramas": {nome: histograma.resumo() for nome, histograma in self._histogramas.items()},
+            }
+
+    def exportar(self):
+        if self._caminho is None:
+            return
+
+        temporario = self._caminho.with_name(self._caminho.name + ".tmp")
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump(self.instantaneo(), arquivo, ensure_ascii=False, indent=2)
+        os.replace(temporario, self._caminho)
+
+    def _exportar_periodicamente(self):
+        while not self._parar.wait(self._intervalo):
+            self.exportar()
+
+    def fechar(self):
+        if self._exportador is not None:
+            self._parar.set()
+            self._exportador.join()
+            self._exportador = None
+            self.exportar()
+
+
+METRICAS = None
+
+
+def configurar_metricas(habilitar=True, caminho=None, intervalo=10.0):
+    global METRICAS
+
+    if METRICAS is not None:
+        METRICAS.fechar()
+
+    METRICAS = Metricas(caminho, intervalo) if habilitar else None
+    if METRICAS is not None:
+        from . import log
+
+        METRICAS.medir("log.pendentes", lambda: log.LOG_TRANSACOES.pendentes)
+        METRICAS.medir("log.fila", lambda: log.LOG_TRANSACOES.tamanho_fila)
+        METRICAS.medir("log.descartados", lambda: log.LOG_TRANSACOES.descartados)
+    return METRICAS
+
+
+def ler_metricas():
+    metricas = METRICAS
+    return None if metricas is None else metricas.instantaneo()
+
+
+def contar_metrica(nome, quantidade=1):
+    metricas = METRICAS
+    if metricas is not None:
+        metricas.contar(nome, quantidade)
+
+
+def observar_metrica(nome, valor, limites=LIMITES_LATENCIA):
+    metricas = METRICAS
+    if metricas is not None:
+        metricas.observar(nome, valor, limites)
+
+
+def percentil(ordenados, percentual):
+    if not ordenados:
+        return None
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * percentual / 100))]
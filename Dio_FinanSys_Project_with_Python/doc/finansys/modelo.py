@@ -0,0 +1,691 @@
+import contextvars
+import itertools
+import threading
+import time
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN
+from pathlib import Path
+
+from . import metricas
+from .metricas import contar_metrica
+
+
+ROOT_PATH = Path(__file__).parent.parent
+FORMATO_DATA = "%d-%m-%Y %H:%M:%S"
+TAMANHO_PAGINA_EXTRATO = 10
+LIMITE_SAQUE_PADRAO = 50000
+TIPOS_TRANSACAO = ("Saque", "Deposito", "Transferencia")
+CODIGOS_TRANSACAO = {tipo: codigo for codigo, tipo in enumerate(TIPOS_TRANSACAO)}
+CODIGO_TRANSFERENCIA = CODIGOS_TRANSACAO["Transferencia"]
+JANELAS_CONTAGEM = {
+    "dia": lambda dia: dia,
+    "mes": lambda dia: (dia.year, dia.month),
+}
+INDICES_JANELA = {janela: indice for indice, janela in enumerate(JANELAS_CONTAGEM)}
+BASES_JANELA = tuple((indice + 1) * len(TIPOS_TRANSACAO) for indice in range(len(JANELAS_CONTAGEM)))
+FAIXA_CONTAGEM_DIA = slice(
+    BASES_JANELA[INDICES_JANELA["dia"]], BASES_JANELA[INDICES_JANELA["dia"]] + len(TIPOS_TRANSACAO)
+)
+
+
+_AVISOS = contextvars.ContextVar("avisos", default=None)
+_DIA_LOCAL = (0.0, 0.0, None)
+RELOGIO = time.time
+
+
+def configurar_relogio(relogio=None):
+    global RELOGIO
+    RELOGIO = time.time if relogio is None else relogio
+_PERSISTENCIA_PENDENTE = contextvars.ContextVar("persistencia_pendente", default=None)
+
+
+def para_centavos(valor):
+    if isinstance(valor, int):
+        return valor * 100
+
+    texto = str(valor).strip().replace(",", ".")
+    inteiro, _, fracao = texto.partition(".")
+    if inteiro.isascii() and inteiro.isdigit() and len(fracao) <= 2 and (not fracao or fracao.isdigit()):
+        return int(inteiro) * 100 + int(fracao.ljust(2, "0"))
+
+    try:
+        reais = Decimal(texto)
+    except InvalidOperation:
+        raise ValueError(f"Valor inválido: {valor!r}")
+
+    if not reais.is_finite():
+        raise ValueError(f"Valor inválido: {valor!r}")
+    return int((reais * 100).quantize(Decimal(1), rounding=ROUND_HALF_EVEN))
+
+
+def dia_local(data):
+    global _DIA_LOCAL
+    limites = _DIA_LOCAL
+    if limites[0] <= data < limites[1]:
+        return limites
+
+    dia = datetime.fromtimestamp(data).date()
+    abertura = datetime.combine(dia, datetime.min.time())
+    limites = _DIA_LOCAL = (abertura.timestamp(), (abertura + timedelta(days=1)).timestamp(), dia)
+    return limites
+
+
+def formatar_valor(centavos):
+    sinal = "-" if centavos < 0 else ""
+    reais, resto = divmod(abs(centavos), 100)
+    return f"{sinal}{reais}.{resto:02d}"
+
+
+def avisar(mensagem):
+    avisos = _AVISOS.get()
+    if avisos is None:
+        print(mensagem)
+    else:
+        avisos.append(mensagem)
+
+
+def normalizar_cpf(cpf):
+    cpf = str(cpf)
+    if cpf.isdigit():
+        return cpf
+    return "".join(filter(str.isdigit, cpf))
+
+
+class ContaIterador:
+
+    def __init__(self, contas):
+        self.contas = contas
+        self._index = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            conta = self.contas[self._index]
+            self._index += 1
+            return conta
+        except IndexError:
+            raise StopIteration
+
+
+class RegistroClientes:
+    FAIXAS_TRAVA = 16
+
+    def __init__(self, clientes=()):
+        self._clientes = []
+        self._indice = {}
+        self._travas = [threading.Lock() for _ in range(self.FAIXAS_TRAVA)]
+        self.carregar(clientes)
+
+    def __iter__(self):
+        return iter(self._clientes)
+
+    def __len__(self):
+        return len(self._clientes)
+
+    def __getitem__(self, indice):
+        return self._clientes[indice]
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: ({len(self._clientes)} clientes)>"
+
+    def buscar(self, cpf):
+        return self._indice.get(normalizar_cpf(cpf))
+
+    def adicionar(self, cliente):
+        chave = normalizar_cpf(cliente.cpf)
+        with self._travas[hash(chave) % self.FAIXAS_TRAVA]:
+            if chave in self._indice:
+                return False
+
+            self._indice[chave] = cliente
+            self._clientes.append(cliente)
+        return True
+
+    def carregar(self, clientes):
+        for trava in self._travas:
+            trava.acquire()
+        try:
+            indice = self._indice
+            novos = []
+            for cliente in clientes:
+                chave = normalizar_cpf(cliente.cpf)
+                if chave not in indice:
+                    indice[chave] = cliente
+                    novos.append(cliente)
+
+            self._clientes.extend(novos)
+        finally:
+            for trava in self._travas:
+                trava.release()
+        return len(novos)
+
+
+class Cliente:
+    __slots__ = ("endereco", "contas")
+
+    def __init__(self, endereco):
+        self.endereco = endereco
+        self.contas = []
+
+    def realizar_transacao(self, conta, transacao):
+        coletor = metricas.METRICAS
+        if coletor is None:
+            return self._realizar_transacao(conta, transacao)
+
+        inicio = time.perf_counter()
+        sucesso = self._realizar_transacao(conta, transacao)
+        coletor.observar(f"latencia.{transacao.__class__.__name__}", time.perf_counter() - inicio)
+        return sucesso
+
+    def _realizar_transacao(self, conta, transacao):
+        with travar_contas(*transacao.contas_envolvidas(conta)):
+            # O limite diário vale para as operações iniciadas pela conta; créditos de
+            # transferências recebidas não contam, e o recebedor não é verificado.
+            if conta.historico.quantidade_do_dia() >= 2:
+                contar_metrica("transacoes.rejeitadas_limite_diario")
+                avisar("\n@@@ Você excedeu o número de transações permitidas para hoje!")
+                return False
+
+            return transacao.registrar(conta)
+
+    def adicionar_conta(self, conta):
+        self.contas.append(conta)
+
+
+class PessoaFisica(Cliente):
+    __slots__ = ("nome", "data_nascimento", "cpf")
+
+    def __init__(self, nome, data_nascimento, cpf, endereco):
+        super().__init__(endereco)
+        self.nome = nome
+        self.data_nascimento = data_nascimento
+        self.cpf = cpf
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: ('{self.cpf}')>"
+
+
+class Conta:
+    __slots__ = ("_saldo", "_numero", "_agencia", "_cliente", "_historico", "_trava")
+
+    def __init__(self, numero, cliente):
+        self._saldo = 0
+        self._numero = numero
+        self._agencia = "0001"
+        self._cliente = cliente
+        self._historico = Historico()
+        self._trava = threading.RLock()
+
+    @classmethod
+    def nova_conta(cls, cliente, numero):
+        return cls(numero, cliente)
+
+    @property
+    def saldo(self):
+        return self._saldo
+
+    @property
+    def numero(self):
+        return self._numero
+
+    @property
+    def agencia(self):
+        return self._agencia
+
+    @property
+    def cliente(self):
+        return self._cliente
+
+    @property
+    def historico(self):
+        return self._historico
+
+    @property
+    def trava(self):
+        return self._trava
+
+    def sacar(self, valor):
+        saldo = self.saldo
+        excedeu_saldo = valor > saldo
+        
+        if excedeu_saldo:
+            contar_metrica("saques.rejeitados_saldo")
+            avisar("\n@@@ Operação falhou! Você não tem saldo suficiente. @@@")
+
+        elif valor > 0:
+            self._saldo -= valor
+            
+            contar_metrica("saques")
+            avisar("\n=== Saque realizado com sucesso! ===")
+            return True
+
+        else:
+            contar_metrica("saques.rejeitados_valor")
+            avisar("\n@@@ Operação falhou! O valor informado é inválido. @@@")
+
+        return False
+
+    def depositar(self, valor):
+        if valor > 0:
+            self._saldo += valor
+            contar_metrica("depositos")
+            avisar("\n=== Depósito realizado com sucesso! ===")
+            return True
+        else:
+            contar_metrica("depositos.rejeitados_valor")
+            avisar("\n@@@ Operação falhou! O valor informado é inválido. @@@")
+            return False
+
+
+class ContaCorrente(Conta):
+    __slots__ = ("_limite", "_limite_saques", "_janela_saques")
+
+    def __init__(self, numero, cliente, limite=LIMITE_SAQUE_PADRAO, limite_saques=3, janela_saques=None):
+        super().__init__(numero, cliente)
+        self._limite = limite
+        self._limite_saques = limite_saques
+        self._janela_saques = janela_saques
+
+    def sacar(self, valor):
+        numero_saques = self.historico.quantidade(Saque.__name__, self._janela_saques)
+
+        excedeu_limite = valor > self._limite
+        excedeu_saques = numero_saques >= self._limite_saques
+
+        if excedeu_limite:
+            contar_metrica("saques.rejeitados_limite")
+            avisar("\n@@@ Operação falhou! O valor do saque excede o limite. @@@")
+
+        elif excedeu_saques:
+            contar_metrica("saques.rejeitados_quantidade")
+            avisar("\n@@@ Operação falhou! Número máximo de saques excedido. @@@")
+
+        else:
+            return super().sacar(valor)
+
+        return False
+
+    def __str__(self):
+        return f"""\
+            Agência:\t{self.agencia}
+            C/C:\t\t{self.numero}
+            Titular:\t{self.cliente.nome}
+            Saldo:\tR$ {formatar_valor(self.saldo)}
+        """
+
+
+RegistroTransacao = namedtuple("RegistroTransacao", ("tipo", "valor", "data"))
+_TRAVAS_CARGA = tuple(threading.RLock() for _ in range(64))
+
+
+class Historico:
+    __slots__ = (
+        "_tipos",
+        "_valores",
+        "_datas",
+        "_dia",
+        "_abertura_dia",
+        "_fechamento_dia",
+        "_inicio_dia",
+        "_recebidas_dia",
+        "_contagem",
+        "_chaves_janela",
+        "_posicoes_tipo",
+        "_ordenado",
+        "_carregador",
+        "_ao_adicionar",
+    )
+
+    def __init__(self):
+        self._tipos = array("B")
+        self._valores = array("q")
+        self._datas = array("d")
+        self._zerar_contadores()
+        self._ordenado = True
+        self._carregador = None
+        self._ao_adicionar = None
+
+    @property
+    def transacoes(self):
+        self._garantir_carregado()
+        return [self._montar(indice) for indice in range(len(self._tipos))]
+
+    def __len__(self):
+        self._garantir_carregado()
+        return len(self._tipos)
+
+    def colunas(self):
+        self._garantir_carregado()
+        return self._tipos, self._valores, self._datas
+
+    def posicoes(self, tipo_transacao):
+        self._garantir_carregado()
+        posicoes = self._posicoes_tipo[CODIGOS_TRANSACAO[tipo_transacao]]
+        return array("L") if posicoes is None else posicoes
+
+    def carregar_sob_demanda(self, carregador):
+        self._carregador = carregador
+
+    def _garantir_carregado(self):
+        if self._carregador is None:
+            return
+
+        with _TRAVAS_CARGA[id(self) % len(_TRAVAS_CARGA)]:
+            carregador = self._carregador
+            if carregador is not None:
+                self.carregar(*carregador())
+
+    def _montar(self, indice):
+        return RegistroTransacao(
+            TIPOS_TRANSACAO[self._tipos[indice]],
+            self._valores[indice],
+            datetime.fromtimestamp(self._datas[indice]).strftime(FORMATO_DATA),
+        )
+
+    def adicionar_transacao(self, transacao, valor=None, data=None):
+        codigo = CODIGOS_TRANSACAO[transacao.__class__.__name__]
+        valor = transacao.valor if valor is None else valor
+        data = RELOGIO() // 1 if data is None else data
+        self.anexar(codigo, valor, data)
+
+        if self._ao_adicionar is not None:
+            self._ao_adicionar(codigo, valor, data)
+
+    def anexar(self, codigo, valor, data):
+        self._garantir_carregado()
+        if self._datas and data < self._datas[-1]:
+            self._ordenado = False
+        self._tipos.append(codigo)
+        self._valores.append(valor)
+        self._datas.append(data)
+        self._contar(codigo, data, len(self._tipos) - 1)
+
+    def carregar(self, tipos, valores, datas):
+        self._tipos = tipos if isinstance(tipos, array) else array("B", tipos)
+        self._valores = valores if isinstance(valores, array) else array("q", valores)
+        self._datas = datas if isinstance(datas, array) else array("d", datas)
+        self._reconstruir_contadores()
+        self._carregador = None
+
+    def _zerar_contadores(self):
+        self._dia = None
+        self._abertura_dia = self._fechamento_dia = 0.0
+        self._inicio_dia = 0
+        self._recebidas_dia = 0
+        self._contagem = [0] * (len(TIPOS_TRANSACAO) * (len(JANELAS_CONTAGEM) + 1))
+        self._chaves_janela = [None] * len(JANELAS_CONTAGEM)
+        self._posicoes_tipo = [None] * len(TIPOS_TRANSACAO)
+
+    def _contar(self, codigo, data, indice):
+        if not self._abertura_dia <= data < self._fechamento_dia:
+            self._mudar_dia(data, indice)
+        if codigo == CODIGO_TRANSFERENCIA and self._valores[indice] > 0:
+            self._recebidas_dia += 1
+
+        posicoes = self._posicoes_tipo[codigo]
+        if posicoes is None:
+            posicoes = self._posicoes_tipo[codigo] = array("L")
+        posicoes.append(indice)
+
+        contagem = self._contagem
+        contagem[codigo] += 1
+        for base in BASES_JANELA:
+            contagem[base + codigo] += 1
+
+    def _mudar_dia(self, data, indice):
+        self._abertura_dia, self._fechamento_dia, dia = dia_local(data)
+        self._dia = dia
+        self._inicio_dia = indice
+        self._recebidas_dia = 0
+
+        quantidade_tipos = len(TIPOS_TRANSACAO)
+        for indice_janela, (base, chave_janela) in enumerate(zip(BASES_JANELA, JANELAS_CONTAGEM.values())):
+            chave = chave_janela(dia)
+            if self._chaves_janela[indice_janela] != chave:
+                self._chaves_janela[indice_janela] = chave
+                self._contagem[base:base + quantidade_tipos] = [0] * quantidade_tipos
+
+    def _reconstruir_contadores(self):
+        self._zerar_contadores()
+        self._ordenado = all(anterior <= data for anterior, data in zip(self._datas, self._datas[1:]))
+        for indice, (codigo, data) in enumerate(zip(self._tipos, self._datas)):
+            self._contar(codigo, data, indice)
+
+    def quantidade(self, tipo_transacao=None, janela=None):
+        self._garantir_carregado()
+        quantidade_tipos = len(TIPOS_TRANSACAO)
+        if janela is None:
+            base = 0
+        else:
+            indice_janela = INDICES_JANELA[janela]
+            if self._chaves_janela[indice_janela] != JANELAS_CONTAGEM[janela](dia_local(RELOGIO())[2]):
+                return 0
+            base = (indice_janela + 1) * quantidade_tipos
+
+        if tipo_transacao is None:
+            return sum(self._contagem[base:base + quantidade_tipos])
+        return self._contagem[base + CODIGOS_TRANSACAO[tipo_transacao]]
+
+    def quantidade_do_dia(self):
+        self._garantir_carregado()
+        if not self._abertura_dia <= RELOGIO() < self._fechamento_dia:
+            return 0
+        return sum(self._contagem[FAIXA_CONTAGEM_DIA]) - self._recebidas_dia
+
+    def transacoes_do_dia(self):
+        self._garantir_carregado()
+        if self._dia != dia_local(RELOGIO())[2]:
+            return []
+        return [self._montar(indice) for indice in range(self._inicio_dia, len(self._tipos))]
+
+    def gerar_relatorio(self, tipo_transacao=None, inicio=None, fim=None, limite=None, deslocamento=0):
+        codigo = None if tipo_transacao is None else CODIGOS_TRANSACAO.get(tipo_transacao)
+        if tipo_transacao is not None and codigo is None:
+            return
+
+        self._garantir_carregado()
+        posicoes = range(len(self._tipos)) if codigo is None else self._posicoes_tipo[codigo]
+        if posicoes is None:
+            return
+        inicio = inicio.timestamp() if inicio is not None else None
+        fim = fim.timestamp() if fim is not None else None
+
+        if not self._ordenado:
+            selecionadas = (
+                indice
+                for indice in posicoes
+                if (inicio is None or self._datas[indice] >= inicio)
+                and (fim is None or self._datas[indice] <= fim)
+            )
+            parada = None if limite is None else deslocamento + limite
+            for indice in itertools.islice(selecionadas, deslocamento, parada):
+                yield self._montar(indice)
+            return
+
+        data_da_posicao = self._datas.__getitem__
+        primeira = 0 if inicio is None else bisect_left(posicoes, inicio, key=data_da_posicao)
+        ultima = len(posicoes) if fim is None else bisect_right(posicoes, fim, key=data_da_posicao)
+        primeira += deslocamento
+        if limite is not None:
+            ultima = min(ultima, primeira + limite)
+
+        for posicao in range(primeira, ultima):
+            yield self._montar(posicoes[posicao])
+
+
+class Transacao(ABC):
+    __slots__ = ()
+
+    @property
+    @abstractmethod
+    def valor(self):
+        pass
+
+    @abstractmethod
+    def registrar(self, conta):
+        pass
+
+    def contas_envolvidas(self, conta):
+        return (conta,)
+
+
+class _TravasOrdenadas:
+    __slots__ = ("_travas",)
+
+    def __init__(self, travas):
+        self._travas = travas
+
+    def __enter__(self):
+        adquiridas = 0
+        try:
+            for trava in self._travas:
+                trava.acquire()
+                adquiridas += 1
+        except BaseException:
+            for trava in reversed(self._travas[:adquiridas]):
+                trava.release()
+            raise
+        return self
+
+    def __exit__(self, *excecao):
+        for trava in reversed(self._travas):
+            trava.release()
+
+
+def travar_contas(*contas):
+    if len(contas) == 1:
+        return contas[0].trava
+
+    if len(contas) == 2:
+        primeira, segunda = contas
+        if primeira is segunda:
+            return primeira.trava
+        if (segunda.numero, id(segunda)) < (primeira.numero, id(primeira)):
+            primeira, segunda = segunda, primeira
+        return _TravasOrdenadas((primeira.trava, segunda.trava))
+
+    unicas = {id(conta): conta for conta in contas}.values()
+    ordenadas = sorted(unicas, key=lambda conta: (conta.numero, id(conta)))
+    return _TravasOrdenadas([conta.trava for conta in ordenadas])
+
+
+class Saque(Transacao):
+    __slots__ = ("_valor",)
+
+    def __init__(self, valor):
+        self._valor = valor
+
+    @property
+    def valor(self):
+        return self._valor
+
+    def registrar(self, conta):
+        with conta.trava:
+            sucesso_transacao = conta.sacar(self.valor)
+
+            if sucesso_transacao:
+                conta.historico.adicionar_transacao(self)
+
+        return sucesso_transacao
+
+
+class Deposito(Transacao):
+    __slots__ = ("_valor",)
+
+    def __init__(self, valor):
+        self._valor = valor
+
+    @property
+    def valor(self):
+        return self._valor
+
+    def registrar(self, conta):
+        with conta.trava:
+            sucesso_transacao = conta.depositar(self.valor)
+
+            if sucesso_transacao:
+                conta.historico.adicionar_transacao(self)
+
+        return sucesso_transacao
+
+
+class Transferencia(Transacao):
+    __slots__ = ("_valor", "_destino")
+
+    def __init__(self, valor, destino):
+        self._valor = valor
+        self._destino = destino
+
+    @property
+    def valor(self):
+        return self._valor
+
+    @property
+    def destino(self):
+        return self._destino
+
+    def contas_envolvidas(self, conta):
+        return (conta, self._destino)
+
+    def registrar(self, conta):
+        if self.valor <= 0:
+            avisar("\n@@@ Operação falhou! O valor informado é inválido. @@@")
+            return False
+
+        if conta is self._destino:
+            avisar("\n@@@ Operação falhou! A conta de destino é a mesma de origem. @@@")
+            return False
+
+        sucesso_transacao = registrar_pernas(self, [(conta, -self.valor), (self._destino, self.valor)])
+        if sucesso_transacao:
+            contar_metrica("transferencias")
+            avisar("\n=== Transferência realizada com sucesso! ===")
+        return sucesso_transacao
+
+
+def registrar_pernas(transacao, pernas):
+    if any(valor == 0 for _, valor in pernas) or sum(valor for _, valor in pernas) != 0:
+        avisar("\n@@@ Operação falhou! O valor informado é inválido. @@@")
+        return False
+
+    with travar_contas(*(conta for conta, _ in pernas)):
+        saldos = {}
+        for conta, valor in pernas:
+            saldos[id(conta)] = saldos.get(id(conta), conta.saldo) + valor
+            if saldos[id(conta)] < 0:
+                contar_metrica("transferencias.rejeitadas_saldo")
+                avisar("\n@@@ Operação falhou! Você não tem saldo suficiente. @@@")
+                return False
+
+        data = RELOGIO() // 1
+        pendentes = []
+        token = _PERSISTENCIA_PENDENTE.set(pendentes)
+        try:
+            for conta, valor in pernas:
+                conta._saldo += valor
+                conta.historico.adicionar_transacao(transacao, valor, data)
+        finally:
+            _PERSISTENCIA_PENDENTE.reset(token)
+        persistir_pendentes(pendentes)
+
+    return True
+
+
+def persistir_pendentes(pendentes):
+    por_destino = {}
+    for registrar, registro in pendentes:
+        por_destino.setdefault(registrar, []).append(registro)
+    for registrar, registros in por_destino.items():
+        registrar(registros)
+
+
+def filtrar_cliente(cpf, clientes):
+    if isinstance(clientes, RegistroClientes):
+        return clientes.buscar(cpf)
+    return next((cliente for cliente in clientes if cliente.cpf == cpf), None)
@@ -0,0 +1,123 @@
+import cProfile
+import heapq
+import json
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from . import log
+from .log import _ESPERA_ENTRADA, ArquivoLog
+from .modelo import ROOT_PATH
+
+
+class PerfilOperacoes:
+    def __init__(self, caminho, taxa=0.0, limite_lento=None, alocacoes=False, linhas_cprofile=20, semente=None):
+        self._saida = ArquivoLog(caminho, tamanho_lote=1)
+        self._taxa = taxa
+        self._limite_lento = limite_lento
+        self._alocacoes = alocacoes
+        self._linhas_cprofile = linhas_cprofile
+        self._aleatorio = random.Random(semente)
+        self._trava = threading.Lock()
+        self._perfilar_proxima = set()
+
+    @property
+    def caminho(self):
+        return self._saida.caminho
+
+    def _amostrar(self, nome):
+        with self._trava:
+            if nome in self._perfilar_proxima:
+                self._perfilar_proxima.discard(nome)
+                return True
+            return self._taxa > 0 and self._aleatorio.random() < self._taxa
+
+    def executar(self, func, args, kwargs):
+        nome = func.__name__
+        amostrada = self._amostrar(nome)
+        perfilador = cProfile.Profile() if amostrada else None
+        rastrear = amostrada and self._alocacoes
+        iniciou_rastreio = rastrear and not tracemalloc.is_tracing()
+        if iniciou_rastreio:
+            tracemalloc.start()
+        elif rastrear:
+            tracemalloc.reset_peak()
+        memoria_inicial = tracemalloc.get_traced_memory()[0] if rastrear else None
+
+        erro = None
+        espera = [0.0]
+        token = _ESPERA_ENTRADA.set(espera)
+        inicio_parede = time.perf_counter()
+        inicio_cpu = time.thread_time()
+        try:
+            if perfilador is None:
+                return func(*args, **kwargs)
+            return perfilador.runcall(func, *args, **kwargs)
+        except BaseException as excecao:
+            erro = repr(excecao)
+            raise
+        finally:
+            parede = time.perf_counter() - inicio_parede - espera[0]
+            cpu = time.thread_time() - inicio_cpu
+            _ESPERA_ENTRADA.reset(token)
+            alocacoes = None
+            if rastrear:
+                memoria_final, pico = tracemalloc.get_traced_memory()
+                alocacoes = {"liquido_bytes": memoria_final - memoria_inicial, "pico_bytes": pico - memoria_inicial}
+                if iniciou_rastreio:
+                    tracemalloc.stop()
+
+            lenta = self._limite_lento is not None and parede >= self._limite_lento
+            if lenta and not amostrada:
+                with self._trava:
+                    self._perfilar_proxima.add(nome)
+
+            if amostrada or lenta:
+                self._gravar(nome, parede, cpu, espera[0], amostrada, lenta, alocacoes, perfilador, erro)
+
+    def _gravar(self, nome, parede, cpu, espera, amostrada, lenta, alocacoes, perfilador, erro):
+        entrada = {
+            "timestamp": datetime.now().isoformat(timespec="milliseconds"),
+            "funcao": nome,
+            "parede_ms": parede * 1000,
+            "cpu_ms": cpu * 1000,
+            "amostrada": amostrada,
+            "lenta": lenta,
+        }
+        if espera:
+            entrada["espera_entrada_ms"] = espera * 1000
+        if alocacoes is not None:
+            entrada["alocacoes"] = alocacoes
+        if erro is not None:
+            entrada["erro"] = erro
+        if perfilador is not None:
+            entrada["cprofile"] = self._resumir_cprofile(perfilador)
+        self._saida.escrever(json.dumps(entrada, ensure_ascii=False) + "\n")
+
+    def _resumir_cprofile(self, perfilador):
+        estatisticas = pstats.Stats(perfilador).stats
+        maiores = heapq.nlargest(self._linhas_cprofile, estatisticas.items(), key=lambda item: item[1][3])
+        return [
+            {
+                "funcao": f"{Path(arquivo).name}:{linha}({funcao})",
+                "chamadas": chamadas,
+                "tempo_proprio_ms": proprio * 1000,
+                "tempo_acumulado_ms": acumulado * 1000,
+            }
+            for (arquivo, linha, funcao), (_, chamadas, proprio, acumulado, _) in maiores
+        ]
+
+    def fechar(self):
+        self._saida.fechar()
+
+
+def configurar_perfil(habilitar=True, caminho=None, **opcoes):
+    if log.PERFIL is not None:
+        log.PERFIL.fechar()
+
+    log.PERFIL = PerfilOperacoes(caminho or ROOT_PATH / "perfil.jsonl", **opcoes) if habilitar else None
+    return log.PERFIL
@@ -0,0 +1,185 @@
+import heapq
+import multiprocessing
+import time
+from array import array
+from bisect import bisect_right
+from datetime import date
+from functools import partial
+
+from .modelo import TIPOS_TRANSACAO, Conta, ContaCorrente, ContaIterador, Saque, formatar_valor
+
+
+FAIXAS_SALDO = (0, 10000, 50000, 100000, 500000, 1000000)
+ORDINAL_EPOCA = date(1970, 1, 1).toordinal()
+
+
+def _somar_por_dia(historico, totais, deslocamentos):
+    hora_atual = None
+    for codigo, valor, data in zip(*historico.colunas()):
+        hora = data // 3600
+        if hora != hora_atual:
+            hora_atual = hora
+            deslocamento = deslocamentos.get(hora)
+            if deslocamento is None:
+                deslocamento = deslocamentos[hora] = time.localtime(hora * 3600).tm_gmtoff
+        dia = (data + deslocamento) // 86400
+        por_dia = totais[codigo]
+        por_dia[dia] = por_dia.get(dia, 0) + valor
+
+
+def totais_por_dia(contas):
+    totais = [{} for _ in TIPOS_TRANSACAO]
+    deslocamentos = {}
+    for conta in ContaIterador(contas):
+        _somar_por_dia(conta.historico, totais, deslocamentos)
+
+    dias = sorted(set().union(*totais))
+    tabela = {"dia": [date.fromordinal(ORDINAL_EPOCA + int(dia)) for dia in dias]}
+    for tipo, por_dia in zip(TIPOS_TRANSACAO, totais):
+        tabela[tipo] = array("q", (por_dia.get(dia, 0) for dia in dias))
+    return tabela
+
+
+def distribuicao_saldos(contas, faixas=FAIXAS_SALDO):
+    quantidades = array("L", bytes(array("L").itemsize * (len(faixas) + 1)))
+    for conta in ContaIterador(contas):
+        quantidades[bisect_right(faixas, conta.saldo)] += 1
+
+    rotulos = [f"< {formatar_valor(faixas[0])}"]
+    rotulos += [
+        f"{formatar_valor(inicio)} a {formatar_valor(fim)}" for inicio, fim in zip(faixas, faixas[1:])
+    ]
+    rotulos.append(f">= {formatar_valor(faixas[-1])}")
+    return {"faixa": rotulos, "contas": quantidades}
+
+
+def top_contas_por_volume(contas, n=10):
+    volumes = (
+        (sum(map(abs, conta.historico.colunas()[1])), conta.numero) for conta in ContaIterador(contas)
+    )
+    maiores = heapq.nlargest(n, volumes)
+    return {
+        "conta": array("L", (numero for _, numero in maiores)),
+        "volume": array("q", (volume for volume, _ in maiores)),
+    }
+
+
+def utilizacao_limite_saques(contas):
+    tabela = {
+        "conta": array("L"),
+        "saques": array("L"),
+        "limite_saques": array("L"),
+        "utilizacao": array("d"),
+    }
+    for conta in ContaIterador(contas):
+        limite = getattr(conta, "_limite_saques", None)
+        if not limite:
+            continue
+
+        saques = conta.historico.quantidade(Saque.__name__, conta._janela_saques)
+        tabela["conta"].append(conta.numero)
+        tabela["saques"].append(saques)
+        tabela["limite_saques"].append(limite)
+        tabela["utilizacao"].append(saques / limite)
+    return tabela
+
+
+TAMANHO_FATIA_RELATORIO = 1000
+_CONTAS_RELATORIO = None
+
+
+def _exportar_conta(conta):
+    limite_saques = getattr(conta, "_limite_saques", None)
+    janela_saques = getattr(conta, "_janela_saques", None)
+    return conta.numero, conta.saldo, limite_saques, janela_saques, conta.historico.colunas()
+
+
+def _importar_conta(numero, saldo, limite_saques, janela_saques, colunas):
+    if limite_saques is None:
+        conta = Conta(numero, None)
+    else:
+        conta = ContaCorrente(numero, None, limite_saques=limite_saques, janela_saques=janela_saques)
+    conta._saldo = saldo
+    conta.historico.carregar(*colunas)
+    return conta
+
+
+def _iniciar_trabalhador(dados):
+    global _CONTAS_RELATORIO
+
+    _CONTAS_RELATORIO = [_importar_conta(*conta) for conta in dados]
+
+
+def _relatorio_da_fatia(fatia, faixas, n_top):
+    contas = _CONTAS_RELATORIO[fatia]
+    return {
+        "totais_por_dia": totais_por_dia(contas),
+        "distribuicao_saldos": distribuicao_saldos(contas, faixas),
+        "top_contas_por_volume": top_contas_por_volume(contas, n_top),
+        "utilizacao_limite_saques": utilizacao_limite_saques(contas),
+    }
+
+
+def _mesclar_relatorios(parciais, faixas, n_top):
+    totais = {tipo: {} for tipo in TIPOS_TRANSACAO}
+    distribuicao = distribuicao_saldos([], faixas)
+    maiores = []
+    utilizacao = utilizacao_limite_saques([])
+    for parcial in parciais:
+        tabela = parcial["totais_por_dia"]
+        for tipo in TIPOS_TRANSACAO:
+            for dia, total in zip(tabela["dia"], tabela[tipo]):
+                totais[tipo][dia] = totais[tipo].get(dia, 0) + total
+
+        for indice, quantidade in enumerate(parcial["distribuicao_saldos"]["contas"]):
+            distribuicao["contas"][indice] += quantidade
+
+        top = parcial["top_contas_por_volume"]
+        maiores.extend(zip(top["volume"], top["conta"]))
+
+        for coluna, valores in parcial["utilizacao_limite_saques"].items():
+            utilizacao[coluna].extend(valores)
+
+    dias = sorted(set().union(*totais.values()))
+    totais_tabela = {"dia": dias}
+    for tipo in TIPOS_TRANSACAO:
+        totais_tabela[tipo] = array("q", (totais[tipo].get(dia, 0) for dia in dias))
+
+    maiores = heapq.nlargest(n_top, maiores)
+    return {
+        "totais_por_dia": totais_tabela,
+        "distribuicao_saldos": distribuicao,
+        "top_contas_por_volume": {
+            "conta": array("L", (numero for _, numero in maiores)),
+            "volume": array("q", (volume for volume, _ in maiores)),
+        },
+        "utilizacao_limite_saques": utilizacao,
+    }
+
+
+def gerar_relatorio_banco(
+    contas, trabalhadores=1, tamanho_fatia=TAMANHO_FATIA_RELATORIO, faixas=FAIXAS_SALDO, n_top=10
+):
+    global _CONTAS_RELATORIO
+
+    contas = list(ContaIterador(contas))
+    fatias = [slice(inicio, inicio + tamanho_fatia) for inicio in range(0, len(contas), tamanho_fatia)]
+    tarefa = partial(_relatorio_da_fatia, faixas=faixas, n_top=n_top)
+
+    if trabalhadores > 1 and len(fatias) > 1:
+        # Os processos não herdam o estado do pai: threads vivas (log, diário,
+        # servidor) podem estar com travas tomadas no momento de um fork.
+        metodo = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        dados = [_exportar_conta(conta) for conta in contas]
+        with multiprocessing.get_context(metodo).Pool(
+            min(trabalhadores, len(fatias)), initializer=_iniciar_trabalhador, initargs=(dados,)
+        ) as pool:
+            parciais = pool.map(tarefa, fatias)
+    else:
+        _CONTAS_RELATORIO = contas
+        try:
+            parciais = [tarefa(fatia) for fatia in fatias]
+        finally:
+            _CONTAS_RELATORIO = None
+
+    return _mesclar_relatorios(parciais, faixas, n_top)
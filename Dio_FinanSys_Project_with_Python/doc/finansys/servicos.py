@@ -0,0 +1,230 @@
+import csv
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from . import log, metricas
+from .log import perfilar
+from .metricas import LIMITES_TAMANHO, observar_metrica
+from .modelo import (
+    _AVISOS,
+    TAMANHO_PAGINA_EXTRATO,
+    ContaCorrente,
+    Deposito,
+    PessoaFisica,
+    Saque,
+    Transferencia,
+    avisar,
+    filtrar_cliente,
+    formatar_valor,
+    para_centavos,
+)
+
+
+def _realizar_em_silencio(cliente, conta, transacao):
+    token = _AVISOS.set([])
+    try:
+        return cliente.realizar_transacao(conta, transacao)
+    finally:
+        _AVISOS.reset(token)
+
+
+class ExecutorTransacoes:
+    def __init__(self, max_trabalhadores=None, silencioso=True):
+        self._executor = ThreadPoolExecutor(max_workers=max_trabalhadores, thread_name_prefix="FinanSys")
+        self._silencioso = silencioso
+
+    def submeter(self, cliente, conta, transacao):
+        if self._silencioso:
+            return self._executor.submit(_realizar_em_silencio, cliente, conta, transacao)
+        return self._executor.submit(cliente.realizar_transacao, conta, transacao)
+
+    def mapear(self, operacoes):
+        futuros = [self.submeter(cliente, conta, transacao) for cliente, conta, transacao in operacoes]
+        return [futuro.result() for futuro in futuros]
+
+    def encerrar(self, aguardar=True):
+        self._executor.shutdown(wait=aguardar)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.encerrar()
+
+
+def transferir_em_lote(transferencias):
+    resultados = []
+    avisos = []
+    token = _AVISOS.set(avisos)
+    try:
+        for cliente, origem, destino, valor in transferencias:
+            avisos.clear()
+            resultados.append(cliente.realizar_transacao(origem, Transferencia(valor, destino)))
+    finally:
+        _AVISOS.reset(token)
+
+    sucessos = sum(resultados)
+    log.LOG_TRANSACOES.registrar(
+        "transferir_em_lote",
+        (),
+        {},
+        {"processadas": len(resultados), "sucessos": sucessos, "falhas": len(resultados) - sucessos},
+    )
+    log.LOG_TRANSACOES.flush()
+    return resultados
+
+
+EXTRATO_VAZIO = "Não foram realizadas movimentações."
+
+
+def gerar_extrato(conta, inicio=None, fim=None, cursor=0, limite=None):
+    transacoes = conta.historico.gerar_relatorio(
+        inicio=inicio, fim=fim, limite=limite, deslocamento=cursor
+    )
+    vazio = True
+    for transacao in transacoes:
+        vazio = False
+        yield f"\n{transacao.tipo}:\n\tR$ {formatar_valor(transacao.valor)}\n\t{transacao.data}"
+
+    if vazio and cursor == 0:
+        yield EXTRATO_VAZIO
+
+
+def paginar_extrato(conta, tamanho_pagina=TAMANHO_PAGINA_EXTRATO, cursor=0, inicio=None, fim=None):
+    linhas = list(gerar_extrato(conta, inicio, fim, cursor, tamanho_pagina + 1))
+    if metricas.METRICAS is not None:
+        transacoes = 0 if linhas == [EXTRATO_VAZIO] else min(len(linhas), tamanho_pagina)
+        observar_metrica("extrato.transacoes", transacoes, LIMITES_TAMANHO)
+    if len(linhas) > tamanho_pagina:
+        return linhas[:tamanho_pagina], cursor + tamanho_pagina
+    return linhas, None
+
+
+OPERACOES_LOTE = ("cliente", "conta", "deposito", "saque", "transferencia")
+CAMPOS_LOTE = ("operacao", "cpf", "valor", "destino", "nome", "data_nascimento", "endereco")
+
+
+def ler_lote(caminho, formato=None):
+    caminho = Path(caminho)
+    formato = formato or ("jsonl" if caminho.suffix in (".jsonl", ".json") else "csv")
+    with open(caminho, encoding="utf-8", newline="") as arquivo:
+        if formato == "jsonl":
+            for linha in arquivo:
+                if linha.strip():
+                    yield json.loads(linha)
+        else:
+            yield from csv.DictReader(arquivo)
+
+
+def _motivo(avisos):
+    return avisos[-1].strip().strip("@=").strip() if avisos else None
+
+
+def processar_lote(registros, clientes, contas, armazenamento=None):
+    for numero_linha, registro in enumerate(registros, start=1):
+        sucesso, motivo = _aplicar_com_motivo(registro, clientes, contas, armazenamento)
+        yield {
+            "linha": numero_linha,
+            "operacao": registro.get("operacao"),
+            "cpf": registro.get("cpf"),
+            "sucesso": sucesso,
+            "motivo": motivo,
+        }
+
+
+@perfilar
+def aplicar_registro(registro, clientes, contas, armazenamento=None):
+    return _aplicar_com_motivo(registro, clientes, contas, armazenamento)
+
+
+def _aplicar_com_motivo(registro, clientes, contas, armazenamento):
+    avisos = []
+    token = _AVISOS.set(avisos)
+    try:
+        sucesso = _aplicar_registro(
+            registro.get("operacao"), registro.get("cpf"), registro, clientes, contas, armazenamento
+        )
+    except (KeyError, TypeError, ValueError) as erro:
+        sucesso = False
+        avisos.append(f"Registro inválido: {erro}")
+    finally:
+        _AVISOS.reset(token)
+
+    return sucesso, None if sucesso else _motivo(avisos)
+
+
+def _aplicar_registro(operacao, cpf, registro, clientes, contas, armazenamento):
+    if operacao not in OPERACOES_LOTE:
+        avisar(f"Operação desconhecida: {operacao!r}")
+        return False
+
+    if operacao == "cliente":
+        cliente = PessoaFisica(
+            nome=registro["nome"],
+            data_nascimento=registro.get("data_nascimento"),
+            cpf=cpf,
+            endereco=registro.get("endereco"),
+        )
+        if not clientes.adicionar(cliente):
+            avisar("Já existe cliente com esse CPF!")
+            return False
+
+        if armazenamento is not None:
+            armazenamento.salvar_cliente(cliente)
+        return True
+
+    cliente = filtrar_cliente(cpf, clientes)
+    if not cliente:
+        avisar("Cliente não encontrado!")
+        return False
+
+    if operacao == "conta":
+        conta = ContaCorrente.nova_conta(cliente=cliente, numero=len(contas) + 1)
+        contas.append(conta)
+        cliente.contas.append(conta)
+        if armazenamento is not None:
+            armazenamento.salvar_conta(conta)
+        return True
+
+    if not cliente.contas:
+        avisar("Cliente não possui conta!")
+        return False
+
+    valor = para_centavos(registro["valor"])
+    if operacao == "transferencia":
+        destino = filtrar_cliente(registro["destino"], clientes)
+        if not destino or not destino.contas:
+            avisar("Conta de destino não encontrada!")
+            return False
+        transacao = Transferencia(valor, destino.contas[0])
+    elif operacao == "deposito":
+        transacao = Deposito(valor)
+    else:
+        transacao = Saque(valor)
+    return cliente.realizar_transacao(cliente.contas[0], transacao)
+
+
+def registrar_requisicao(requisicao, sucesso):
+    try:
+        valor = para_centavos(requisicao["valor"]) if "valor" in requisicao else None
+    except ValueError:
+        valor = None
+
+    log.LOG_TRANSACOES.registrar(
+        requisicao.get("operacao"),
+        (),
+        {},
+        sucesso,
+        {"cpf": requisicao.get("cpf"), "valor": valor, "resultado": sucesso},
+    )
+
+
+def importar_lote(caminho, clientes, contas, armazenamento=None, formato=None):
+    resumo = {"processados": 0, "sucessos": 0, "falhas": 0}
+    for resultado in processar_lote(ler_lote(caminho, formato), clientes, contas, armazenamento):
+        resumo["processados"] += 1
+        resumo["sucessos" if resultado["sucesso"] else "falhas"] += 1
+        yield resultado
+
+    log.LOG_TRANSACOES.registrar("importar_lote", (str(caminho),), {}, resumo)
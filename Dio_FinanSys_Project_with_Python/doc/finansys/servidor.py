@@ -0,0 +1,279 @@
+import asyncio
+import json
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from .log import perfilar
+from .metricas import LIMITES_TAMANHO, ler_metricas, observar_metrica, percentil
+from .modelo import TAMANHO_PAGINA_EXTRATO, ContaIterador, filtrar_cliente, formatar_valor, normalizar_cpf
+from .servicos import OPERACOES_LOTE, aplicar_registro, registrar_requisicao
+
+
+class ServidorFinanSys:
+    OPERACOES = OPERACOES_LOTE + ("extrato", "contas", "metricas")
+    FAIXAS_TRAVA = 64
+
+    def __init__(self, clientes, contas, armazenamento=None, max_trabalhadores=None):
+        self._clientes = clientes
+        self._contas = contas
+        self._armazenamento = armazenamento
+        self._executor = ThreadPoolExecutor(max_workers=max_trabalhadores, thread_name_prefix="FinanSys")
+        self._travas_contas = tuple(asyncio.Lock() for _ in range(self.FAIXAS_TRAVA))
+        self._trava_cadastro = asyncio.Lock()
+        self._servidor = None
+
+    async def iniciar(self, host="127.0.0.1", porta=8765, caminho_unix=None):
+        if caminho_unix:
+            self._servidor = await asyncio.start_unix_server(self._atender, path=caminho_unix)
+        else:
+            self._servidor = await asyncio.start_server(self._atender, host, porta)
+        return self._servidor
+
+    async def servir(self, host="127.0.0.1", porta=8765, caminho_unix=None):
+        servidor = await self.iniciar(host, porta, caminho_unix)
+        loop = asyncio.get_running_loop()
+        parar = asyncio.Event()
+        sinais = []
+        for sinal in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sinal, parar.set)
+            except (NotImplementedError, RuntimeError, ValueError):
+                continue
+            sinais.append(sinal)
+
+        try:
+            async with servidor:
+                await parar.wait()
+        finally:
+            for sinal in sinais:
+                loop.remove_signal_handler(sinal)
+            await self.encerrar()
+
+    async def encerrar(self):
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        self._executor.shutdown(wait=True)
+
+    async def _atender(self, leitor, escritor):
+        pendentes = set()
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+
+                tarefa = asyncio.create_task(self._responder(linha, escritor))
+                pendentes.add(tarefa)
+                tarefa.add_done_callback(pendentes.discard)
+
+            if pendentes:
+                await asyncio.gather(*pendentes)
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def _responder(self, linha, escritor):
+        try:
+            requisicao = json.loads(linha)
+        except ValueError:
+            requisicao = None
+
+        try:
+            resposta = await self.processar(requisicao)
+        except Exception as erro:
+            resposta = {"sucesso": False, "motivo": f"Erro ao processar a requisição: {erro}"}
+
+        resposta["id"] = requisicao.get("id") if isinstance(requisicao, dict) else None
+        escritor.write(json.dumps(resposta, ensure_ascii=False).encode("utf-8") + b"\n")
+        if escritor.transport.get_write_buffer_size() > 65536:
+            await escritor.drain()
+
+    async def processar(self, requisicao):
+        if not isinstance(requisicao, dict):
+            return {"sucesso": False, "motivo": "Requisição inválida"}
+
+        try:
+            return await self._processar(requisicao)
+        except (KeyError, TypeError, ValueError) as erro:
+            return {"sucesso": False, "motivo": f"Requisição inválida: {erro}"}
+
+    async def _processar(self, requisicao):
+        operacao = requisicao.get("operacao")
+        if operacao not in self.OPERACOES:
+            return {"sucesso": False, "motivo": f"Operação desconhecida: {operacao!r}"}
+
+        if operacao == "contas":
+            return {"sucesso": True, "contas": self._listar_contas(requisicao)}
+
+        if operacao == "metricas":
+            return {"sucesso": True, "metricas": ler_metricas()}
+
+        loop = asyncio.get_running_loop()
+        chave = normalizar_cpf(requisicao.get("cpf", ""))
+        async with self._travas_contas[hash(chave) % len(self._travas_contas)]:
+            if operacao == "extrato":
+                return await loop.run_in_executor(self._executor, self._extrato, requisicao)
+
+            if operacao in ("cliente", "conta"):
+                async with self._trava_cadastro:
+                    sucesso, motivo = await loop.run_in_executor(self._executor, self._aplicar, requisicao)
+            else:
+                sucesso, motivo = await loop.run_in_executor(self._executor, self._aplicar, requisicao)
+        return {"sucesso": sucesso, "motivo": motivo}
+
+    def _aplicar(self, requisicao):
+        sucesso, motivo = aplicar_registro(requisicao, self._clientes, self._contas, self._armazenamento)
+        registrar_requisicao(requisicao, sucesso)
+        return sucesso, motivo
+
+    @perfilar
+    def _extrato(self, requisicao):
+        cliente = filtrar_cliente(requisicao.get("cpf", ""), self._clientes)
+        if not cliente or not cliente.contas:
+            return {"sucesso": False, "motivo": "Cliente ou conta não encontrado!"}
+
+        conta = cliente.contas[0]
+        inicio = requisicao.get("inicio")
+        fim = requisicao.get("fim")
+        cursor = _inteiro_nao_negativo(requisicao, "cursor", 0)
+        tamanho_pagina = _inteiro_nao_negativo(requisicao, "tamanho_pagina", TAMANHO_PAGINA_EXTRATO)
+        transacoes = list(
+            conta.historico.gerar_relatorio(
+                inicio=datetime.fromisoformat(inicio) if inicio else None,
+                fim=datetime.fromisoformat(fim) if fim else None,
+                limite=tamanho_pagina + 1,
+                deslocamento=cursor,
+            )
+        )
+        proximo = None
+        if len(transacoes) > tamanho_pagina:
+            transacoes = transacoes[:tamanho_pagina]
+            proximo = cursor + tamanho_pagina
+        observar_metrica("extrato.transacoes", len(transacoes), LIMITES_TAMANHO)
+
+        return {
+            "sucesso": True,
+            "conta": conta.numero,
+            "saldo": formatar_valor(conta.saldo),
+            "transacoes": [
+                dict(transacao._asdict(), valor=formatar_valor(transacao.valor)) for transacao in transacoes
+            ],
+            "cursor": proximo,
+        }
+
+    def _listar_contas(self, requisicao):
+        inicio = _inteiro_nao_negativo(requisicao, "cursor", 0)
+        fim = inicio + _inteiro_nao_negativo(requisicao, "tamanho_pagina", 100)
+        return [
+            {
+                "numero": conta.numero,
+                "agencia": conta.agencia,
+                "titular": conta.cliente.nome,
+                "saldo": formatar_valor(conta.saldo),
+            }
+            for conta in ContaIterador(self._contas[inicio:fim])
+        ]
+
+
+def _inteiro_nao_negativo(requisicao, campo, padrao):
+    valor = requisicao.get(campo, padrao)
+    if isinstance(valor, bool) or not isinstance(valor, int) or valor < 0:
+        raise ValueError(f"{campo} deve ser um inteiro não negativo")
+    return valor
+
+
+CICLO_CARGA = ("deposito", "extrato", "saque", "contas")
+
+
+def _requisicao_de_carga(identificador, cpfs):
+    operacao = CICLO_CARGA[identificador % len(CICLO_CARGA)]
+    requisicao = {"id": identificador, "operacao": operacao}
+    if operacao == "contas":
+        requisicao["tamanho_pagina"] = 10
+    else:
+        requisicao["cpf"] = cpfs[identificador // len(CICLO_CARGA) % len(cpfs)]
+        if operacao == "extrato":
+            requisicao["tamanho_pagina"] = 5
+        else:
+            requisicao["valor"] = 10
+    return requisicao
+
+
+async def _conexao_de_carga(host, porta, indice, requisicoes, janela, contas, resultados):
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    cpfs = [f"9{indice:04d}{numero:06d}" for numero in range(contas)]
+    for cpf in cpfs:
+        for requisicao in (
+            {"operacao": "cliente", "cpf": cpf, "nome": f"Carga {indice}"},
+            {"operacao": "conta", "cpf": cpf},
+        ):
+            escritor.write(json.dumps(requisicao).encode("utf-8") + b"\n")
+        await escritor.drain()
+    for _ in range(2 * len(cpfs)):
+        await leitor.readline()
+
+    enviados = {}
+    semaforo = asyncio.Semaphore(janela)
+
+    async def receber():
+        for _ in range(requisicoes):
+            resposta = json.loads(await leitor.readline())
+            operacao, enviado = enviados.pop(resposta["id"])
+            latencias, contagem = resultados.setdefault(operacao, ([], [0, 0]))
+            latencias.append(time.perf_counter() - enviado)
+            contagem[0 if resposta["sucesso"] else 1] += 1
+            semaforo.release()
+
+    recebedor = asyncio.create_task(receber())
+    for identificador in range(requisicoes):
+        await semaforo.acquire()
+        requisicao = _requisicao_de_carga(identificador, cpfs)
+        enviados[identificador] = (requisicao["operacao"], time.perf_counter())
+        escritor.write(json.dumps(requisicao).encode("utf-8") + b"\n")
+
+    await recebedor
+    escritor.close()
+    await escritor.wait_closed()
+
+
+def _resumir_carga(latencias, sucessos, falhas):
+    latencias = sorted(latencias)
+    return {
+        "sucessos": sucessos,
+        "falhas": falhas,
+        "latencia_p50_ms": percentil(latencias, 50) * 1000 if latencias else None,
+        "latencia_p95_ms": percentil(latencias, 95) * 1000 if latencias else None,
+        "latencia_p99_ms": percentil(latencias, 99) * 1000 if latencias else None,
+    }
+
+
+async def gerar_carga(host="127.0.0.1", porta=8765, conexoes=10, requisicoes=1000, janela=32, contas=None):
+    # Por padrão cada conta recebe um único depósito e um único saque, dentro do
+    # limite diário de transações; com menos contas as rejeições aparecem em "falhas".
+    contas = contas or max(1, -(-requisicoes // len(CICLO_CARGA)))
+    resultados = {}
+    inicio = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _conexao_de_carga(host, porta, indice, requisicoes, janela, contas, resultados)
+            for indice in range(conexoes)
+        )
+    )
+    duracao = time.perf_counter() - inicio
+    todas = [latencia for latencias, _ in resultados.values() for latencia in latencias]
+    sucessos = sum(contagem[0] for _, contagem in resultados.values())
+    return {
+        "requisicoes": len(todas),
+        "contas": contas * conexoes,
+        "duracao_s": duracao,
+        "vazao_rps": len(todas) / duracao if duracao else None,
+        **_resumir_carga(todas, sucessos, len(todas) - sucessos),
+        "operacoes": {
+            operacao: {"quantidade": sum(contagem), **_resumir_carga(latencias, *contagem)}
+            for operacao, (latencias, contagem) in resultados.items()
+        },
+    }
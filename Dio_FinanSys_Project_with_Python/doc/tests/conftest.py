@@ -0,0 +1,52 @@
+import atexit
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from finansys import log
+from finansys.log import ArquivoLog
+from finansys.modelo import _AVISOS, ContaCorrente, PessoaFisica
+
+
+@pytest.fixture(autouse=True)
+def log_temporario(tmp_path):
+    original = log.LOG_TRANSACOES
+    log.LOG_TRANSACOES = ArquivoLog(tmp_path / "log.txt")
+    yield log.LOG_TRANSACOES
+    log.LOG_TRANSACOES.fechar()
+    log.LOG_TRANSACOES = original
+
+
+@pytest.fixture
+def avisos():
+    coletados = []
+    token = _AVISOS.set(coletados)
+    yield coletados
+    _AVISOS.reset(token)
+
+
+@pytest.fixture
+def nova_conta():
+    def criar(cpf, numero, saldo=0):
+        cliente = PessoaFisica(nome=f"Cliente {cpf}", data_nascimento="01-01-1990", cpf=cpf, endereco="Rua")
+        conta = ContaCorrente.nova_conta(cliente=cliente, numero=numero)
+        conta._saldo = saldo
+        cliente.adicionar_conta(conta)
+        return cliente, conta
+
+    return criar
+
+
+@pytest.fixture
+def simular_queda():
+    def derrubar(diario):
+        diario.flush()
+        diario._parar.set()
+        diario._arquivo.close()
+        diario._arquivo = None
+        atexit.unregister(diario.fechar)
+
+    return derrubar
@@ -0,0 +1,30 @@
+from finansys.armazenamento import ArmazenamentoSQLite
+from finansys.modelo import ContaCorrente, Deposito, PessoaFisica, Saque
+
+
+def test_sqlite_reabre_saldos_historico_e_contadores_do_dia(tmp_path, avisos):
+    caminho = str(tmp_path / "finansys.db")
+    armazenamento = ArmazenamentoSQLite(caminho, tamanho_lote=2)
+    armazenamento.carregar()
+    cliente = PessoaFisica(nome="Ana", data_nascimento="01-01-1990", cpf="11111111111", endereco="Rua")
+    conta = ContaCorrente.nova_conta(cliente=cliente, numero=1)
+    cliente.adicionar_conta(conta)
+    armazenamento.salvar_cliente(cliente)
+    armazenamento.salvar_conta(conta)
+    assert cliente.realizar_transacao(conta, Deposito(1000))
+    assert cliente.realizar_transacao(conta, Saque(300))
+    armazenamento.fechar()
+
+    armazenamento = ArmazenamentoSQLite(caminho)
+    clientes, contas = armazenamento.carregar()
+    cliente, conta = clientes.buscar("11111111111"), contas[0]
+    assert cliente.nome == "Ana" and cliente.contas == [conta]
+    assert (conta.numero, conta.saldo) == (1, 700)
+    assert conta.historico._carregador is not None
+
+    tipos, valores, _ = conta.historico.colunas()
+    assert (list(tipos), list(valores)) == ([1, 0], [1000, 300])
+    assert conta.historico.quantidade_do_dia() == 2
+    assert not cliente.realizar_transacao(conta, Deposito(100))
+    assert conta.saldo == 700
+    armazenamento.fechar()
@@ -0,0 +1,33 @@
+from finansys.desempenho import reproduzir_carga
+from finansys.modelo import RELOGIO, RegistroClientes
+
+
+def registros_em_dois_dias():
+    yield {"operacao": "cliente", "cpf": "11111111111", "nome": "Ana", "dia": 0, "instante": 0.0}
+    yield {"operacao": "conta", "cpf": "11111111111", "dia": 0, "instante": 0.0}
+    for dia in (0, 1):
+        for hora in (10, 11):
+            instante = dia * 86400 + hora * 3600.0
+            yield {"operacao": "deposito", "cpf": "11111111111", "valor": "10", "dia": dia, "instante": instante}
+
+
+def test_reproducao_usa_o_instante_de_cada_registro():
+    clientes = RegistroClientes()
+    resultado = reproduzir_carga(registros_em_dois_dias(), clientes, registrar_log=False)
+
+    assert resultado["operacoes"]["deposito"]["sucessos"] == 4
+    conta = clientes.buscar("11111111111").contas[0]
+    _, _, datas = conta.historico.colunas()
+    assert datas[-1] - datas[0] >= 86400
+
+
+def test_relogio_real_concentra_a_carga_em_um_dia():
+    resultado = reproduzir_carga(registros_em_dois_dias(), registrar_log=False, relogio_simulado=False)
+    assert resultado["operacoes"]["deposito"]["sucessos"] == 2
+
+
+def test_relogio_e_restaurado_apos_a_reproducao():
+    from finansys import modelo
+
+    reproduzir_carga(registros_em_dois_dias(), registrar_log=False)
+    assert modelo.RELOGIO is RELOGIO
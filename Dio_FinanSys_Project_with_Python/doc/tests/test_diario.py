@@ -0,0 +1,101 @@
+import json
+import time
+
+from finansys.armazenamento import DiarioTransacoes
+from finansys.modelo import ContaCorrente, Deposito, PessoaFisica
+
+
+def abrir(prefixo, **opcoes):
+    diario = DiarioTransacoes(prefixo, **opcoes)
+    clientes, contas = diario.carregar()
+    return diario, clientes, contas
+
+
+def test_cauda_rasgada_e_descartada_antes_de_anexar(tmp_path, avisos, simular_queda):
+    prefixo = tmp_path / "finansys"
+    diario, _, _ = abrir(prefixo)
+    cliente = PessoaFisica(nome="Ana", data_nascimento="01-01-1990", cpf="11111111111", endereco="Rua")
+    conta = ContaCorrente.nova_conta(cliente=cliente, numero=1)
+    cliente.adicionar_conta(conta)
+    diario.salvar_cliente(cliente)
+    diario.salvar_conta(conta)
+    assert cliente.realizar_transacao(conta, Deposito(1000))
+    simular_queda(diario)
+
+    caminho = diario._caminho_segmento(diario._segmento)
+    integro = caminho.stat().st_size
+    with open(caminho, "ab") as arquivo:
+        arquivo.write(b'{"evento":"transacao","conta":1,"cod')
+
+    diario, clientes, contas = abrir(prefixo)
+    assert caminho.stat().st_size == integro
+    cliente, conta = clientes.buscar("11111111111"), contas[0]
+    assert conta.saldo == 1000
+    assert cliente.realizar_transacao(conta, Deposito(500))
+    simular_queda(diario)
+
+    diario, _, contas = abrir(prefixo)
+    assert contas[0].saldo == 1500
+    assert len(contas[0].historico) == 2
+    diario.fechar()
+
+
+def test_grupo_parcial_e_confirmado_pelo_temporizador(tmp_path):
+    diario, _, _ = abrir(tmp_path / "finansys", intervalo_grupo=0.2)
+    cliente = PessoaFisica(nome="Ana", data_nascimento="01-01-1990", cpf="11111111111", endereco="Rua")
+    diario.salvar_cliente(cliente)
+    assert diario._caminho_segmento(diario._segmento).stat().st_size == 0
+
+    limite = time.monotonic() + 2
+    while not diario._caminho_segmento(diario._segmento).stat().st_size and time.monotonic() < limite:
+        time.sleep(0.02)
+    assert diario._caminho_segmento(diario._segmento).stat().st_size > 0
+    diario.fechar()
+
+
+def test_fechar_e_reabrir_preserva_clientes_e_contas(tmp_path, avisos):
+    prefixo = tmp_path / "finansys"
+    diario, _, _ = abrir(prefixo)
+    cliente = PessoaFisica(nome="Ana", data_nascimento="01-01-1990", cpf="11111111111", endereco="Rua")
+    conta = ContaCorrente.nova_conta(cliente=cliente, numero=1)
+    cliente.adicionar_conta(conta)
+    diario.salvar_cliente(cliente)
+    diario.salvar_conta(conta)
+    diario.salvar_conta(conta)
+    assert cliente.realizar_transacao(conta, Deposito(1000))
+    diario.fechar()
+
+    diario, clientes, contas = abrir(prefixo)
+    assert clientes.buscar("11111111111").nome == "Ana"
+    assert [(conta.numero, conta.saldo) for conta in contas] == [(1, 1000)]
+    assert len(contas[0].historico) == 1
+    diario.fechar()
+
+
+def test_snapshot_guarda_saldos_e_historico_fica_nos_segmentos(tmp_path, avisos, simular_queda):
+    prefixo = tmp_path / "finansys"
+    diario, _, _ = abrir(prefixo, intervalo_snapshot=4)
+    cliente = PessoaFisica(nome="Ana", data_nascimento="01-01-1990", cpf="11111111111", endereco="Rua")
+    conta = ContaCorrente.nova_conta(cliente=cliente, numero=1)
+    cliente.adicionar_conta(conta)
+    diario.salvar_cliente(cliente)
+    diario.salvar_conta(conta)
+    for _ in range(9):
+        assert Deposito(100).registrar(conta)
+    simular_queda(diario)
+
+    snapshot = json.loads(diario._caminho_snapshot.read_text(encoding="utf-8"))
+    assert snapshot["contas"] == [dict(snapshot["contas"][0], saldo=600)]
+    assert "historico" not in snapshot["contas"][0]
+    assert [indice for indice, _ in diario._segmentos()] == [1, 2, 3]
+
+    diario, _, contas = abrir(prefixo)
+    assert contas[0].saldo == 900
+    assert contas[0].historico._carregador is not None
+    assert len(contas[0].historico) == 9
+    assert Deposito(100).registrar(contas[0])
+    diario.fechar()
+
+    diario, _, contas = abrir(prefixo)
+    assert (contas[0].saldo, len(contas[0].historico)) == (1000, 10)
+    diario.fechar()
@@ -0,0 +1,54 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+
+from finansys.log import ArquivoLog, consultar_log, ler_manifesto
+
+
+def linha(momento, indice):
+    momento = datetime.fromtimestamp(momento).isoformat(timespec="seconds")
+    return json.dumps({"timestamp": momento, "funcao": "depositar", "valor": indice}) + "\n"
+
+
+def test_rotacao_diaria_registra_segmentos_e_respeita_retencao(tmp_path):
+    caminho = tmp_path / "log.txt"
+    arquivo = ArquivoLog(
+        caminho, tamanho_lote=1, intervalo=0, rotacao_diaria=True, segmentos_retidos=2, formato="jsonl"
+    )
+    primeiro_dia = datetime(2024, 3, 1, 12)
+    for dia in range(4):
+        for hora in range(2):
+            momento = (primeiro_dia + timedelta(days=dia, hours=hora)).timestamp()
+            arquivo.escrever(linha(momento, dia * 2 + hora), momento)
+    arquivo.fechar()
+
+    segmentos = ler_manifesto(caminho)
+    assert [segmento["sequencia"] for segmento in segmentos] == [2, 3]
+    assert [segmento["inicio"][:10] for segmento in segmentos] == ["2024-03-02", "2024-03-03"]
+    assert [segmento["entradas"] for segmento in segmentos] == [2, 2]
+    assert sorted(item.name for item in tmp_path.glob("log-*.txt.gz")) == [s["arquivo"] for s in segmentos]
+
+    with gzip.open(tmp_path / segmentos[0]["arquivo"], "rt", encoding="utf-8") as compactado:
+        assert [json.loads(texto)["valor"] for texto in compactado] == [2, 3]
+
+    entradas = consultar_log(caminho, inicio=datetime(2024, 3, 3))
+    assert [entrada["valor"] for entrada in entradas] == [4, 5, 6, 7]
+
+
+def test_rotacao_por_tamanho_preserva_todas_as_entradas(tmp_path):
+    caminho = tmp_path / "log.txt"
+    arquivo = ArquivoLog(
+        caminho, tamanho_lote=1, intervalo=0, tamanho_maximo=200, segmentos_retidos=None, formato="jsonl"
+    )
+    inicio = datetime(2024, 3, 1, 12).timestamp()
+    for indice in range(10):
+        arquivo.escrever(linha(inicio + indice, indice), inicio + indice)
+    arquivo.fechar()
+
+    segmentos = ler_manifesto(caminho)
+    assert len(segmentos) > 1
+    for segmento in segmentos:
+        with gzip.open(tmp_path / segmento["arquivo"], "rb") as compactado:
+            assert len(compactado.read()) <= 200
+    assert sum(segmento["entradas"] for segmento in segmentos) + len(caminho.read_text().splitlines()) == 10
+    assert [entrada["valor"] for entrada in consultar_log(caminho)] == list(range(10))
@@ -0,0 +1,92 @@
+import random
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from finansys.modelo import TIPOS_TRANSACAO, Historico, para_centavos
+
+
+@pytest.mark.parametrize(
+    "valor, centavos",
+    [(10, 1000), ("10", 1000), ("10,5", 1050), (" 7,05 ", 705), ("1.", 100), (".5", 50), (12.5, 1250), ("1,235", 124)],
+)
+def test_para_centavos(valor, centavos):
+    assert para_centavos(valor) == centavos
+
+
+@pytest.mark.parametrize("valor", ["abc", "", "1,2,3", "nan", "²"])
+def test_para_centavos_rejeita_valor_invalido(valor):
+    with pytest.raises(ValueError):
+        para_centavos(valor)
+
+
+def test_quantidade_do_dia_ignora_dias_anteriores():
+    historico = Historico()
+    agora = datetime.now()
+    historico.anexar(0, 100, (agora - timedelta(days=1)).timestamp())
+    historico.anexar(1, 100, (agora - timedelta(days=1)).timestamp())
+    assert historico.quantidade_do_dia() == 0
+
+    historico.anexar(1, 100, agora.timestamp())
+    assert historico.quantidade_do_dia() == 1
+    assert historico.quantidade(janela="dia") == 1
+    assert historico.quantidade() == 3
+
+
+def test_anexar_durante_carga_sob_demanda_nao_perde_a_transacao():
+    historico = Historico()
+    iniciou, liberar = threading.Event(), threading.Event()
+
+    def carregador():
+        iniciou.set()
+        liberar.wait(5)
+        return [0], [100], [1.7e9]
+
+    historico.carregar_sob_demanda(carregador)
+    leitor = threading.Thread(target=historico.colunas)
+    leitor.start()
+    assert iniciou.wait(5)
+
+    escritor = threading.Thread(target=historico.anexar, args=(1, 200, 1.7e9 + 1))
+    escritor.start()
+    escritor.join(0.2)
+    assert escritor.is_alive()
+
+    liberar.set()
+    leitor.join(5)
+    escritor.join(5)
+    assert list(historico.colunas()[1]) == [100, 200]
+
+
+@pytest.mark.parametrize("ordenado", [True, False])
+def test_gerar_relatorio_filtra_por_tipo_periodo_e_pagina(ordenado):
+    aleatorio = random.Random(3)
+    inicio = datetime(2024, 1, 1)
+    datas = [inicio.timestamp() + aleatorio.randrange(30 * 86400) for _ in range(300)]
+    if ordenado:
+        datas.sort()
+    historico = Historico()
+    historico.carregar(
+        [aleatorio.randrange(len(TIPOS_TRANSACAO)) for _ in datas], [aleatorio.randrange(1, 1000) for _ in datas], datas
+    )
+    assert historico._ordenado is ordenado
+    tipos, _, _ = historico.colunas()
+
+    for tipo in (None, *TIPOS_TRANSACAO):
+        for de, ate in ((None, None), (5, None), (None, 20), (10, 12), (12, 10)):
+            periodo_inicio = None if de is None else inicio + timedelta(days=de)
+            periodo_fim = None if ate is None else inicio + timedelta(days=ate)
+            esperado = [
+                historico._montar(indice)
+                for indice, data in enumerate(datas)
+                if (tipo is None or TIPOS_TRANSACAO[tipos[indice]] == tipo)
+                and (periodo_inicio is None or data >= periodo_inicio.timestamp())
+                and (periodo_fim is None or data <= periodo_fim.timestamp())
+            ]
+            for limite, deslocamento in ((None, 0), (7, 0), (7, 5), (None, 3), (0, 0), (5, len(esperado))):
+                obtido = historico.gerar_relatorio(tipo, periodo_inicio, periodo_fim, limite, deslocamento)
+                parada = None if limite is None else deslocamento + limite
+                assert list(obtido) == esperado[deslocamento:parada]
+
+    assert list(historico.gerar_relatorio("Inexistente")) == []
@@ -0,0 +1,37 @@
+import json
+import time
+
+from finansys import interativo, log
+from finansys.modelo import RegistroClientes
+from finansys.perfil import PerfilOperacoes
+from finansys.servicos import aplicar_registro
+
+
+def test_espera_por_entrada_nao_conta_como_lentidao(tmp_path, monkeypatch):
+    perfil = PerfilOperacoes(tmp_path / "perfil.jsonl", taxa=1.0, limite_lento=0.05)
+    monkeypatch.setattr(log, "PERFIL", perfil)
+
+    def digitar_devagar(mensagem=""):
+        time.sleep(0.1)
+        return "11111111111"
+
+    monkeypatch.setattr("builtins.input", digitar_devagar)
+    interativo.depositar(RegistroClientes())
+    perfil.fechar()
+
+    (entrada,) = [json.loads(linha) for linha in perfil.caminho.read_text(encoding="utf-8").splitlines()]
+    assert entrada["funcao"] == "depositar"
+    assert entrada["lenta"] is False
+    assert entrada["parede_ms"] < 50 <= entrada["espera_entrada_ms"]
+
+
+def test_operacoes_de_servico_passam_pelo_perfil(tmp_path, monkeypatch):
+    perfil = PerfilOperacoes(tmp_path / "perfil.jsonl", taxa=1.0)
+    monkeypatch.setattr(log, "PERFIL", perfil)
+
+    aplicar_registro({"operacao": "cliente", "cpf": "11111111111", "nome": "Ana"}, RegistroClientes(), [])
+    perfil.fechar()
+
+    (entrada,) = [json.loads(linha) for linha in perfil.caminho.read_text(encoding="utf-8").splitlines()]
+    assert entrada["funcao"] == "aplicar_registro"
+    assert entrada["cprofile"]
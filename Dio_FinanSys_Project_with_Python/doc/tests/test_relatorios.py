@@ -0,0 +1,50 @@
+import random
+from datetime import datetime
+
+from finansys.modelo import TIPOS_TRANSACAO
+from finansys.relatorios import gerar_relatorio_banco, totais_por_dia
+
+
+def test_totais_por_dia_agrupam_pela_data_local(nova_conta):
+    aleatorio = random.Random(7)
+    _, conta = nova_conta("11111111111", 1)
+    inicio = datetime(2024, 1, 1).timestamp()
+    datas = [inicio + aleatorio.random() * 400 * 86400 for _ in range(500)]
+    tipos = [aleatorio.randrange(len(TIPOS_TRANSACAO)) for _ in datas]
+    valores = [aleatorio.randrange(1, 10000) for _ in datas]
+    conta.historico.carregar(tipos, valores, datas)
+
+    esperado = {}
+    for codigo, valor, data in zip(tipos, valores, datas):
+        chave = (TIPOS_TRANSACAO[codigo], datetime.fromtimestamp(data).date())
+        esperado[chave] = esperado.get(chave, 0) + valor
+
+    tabela = totais_por_dia([conta])
+    obtido = {
+        (tipo, dia): total
+        for tipo in TIPOS_TRANSACAO
+        for dia, total in zip(tabela["dia"], tabela[tipo])
+        if total
+    }
+    assert obtido == esperado
+    assert tabela["dia"] == sorted(tabela["dia"])
+
+
+def test_relatorio_paralelo_igual_ao_serial(nova_conta):
+    aleatorio = random.Random(11)
+    inicio = datetime(2024, 1, 1).timestamp()
+    contas = []
+    for numero in range(1, 41):
+        _, conta = nova_conta(f"{numero:011d}", numero, saldo=aleatorio.randrange(0, 2000000))
+        datas = sorted(inicio + aleatorio.random() * 60 * 86400 for _ in range(aleatorio.randrange(0, 30)))
+        conta.historico.carregar(
+            [aleatorio.randrange(len(TIPOS_TRANSACAO)) for _ in datas],
+            [aleatorio.randrange(1, 10000) for _ in datas],
+            datas,
+        )
+        contas.append(conta)
+
+    serial = gerar_relatorio_banco(contas, trabalhadores=1, tamanho_fatia=7)
+    paralelo = gerar_relatorio_banco(contas, trabalhadores=3, tamanho_fatia=7)
+    assert paralelo == serial
+    assert len(serial["utilizacao_limite_saques"]["conta"]) == 40
@@ -0,0 +1,20 @@
+from finansys.modelo import _AVISOS, RegistroClientes, avisar
+from finansys.servicos import processar_lote
+
+
+def test_processar_lote_nao_mantem_avisos_entre_linhas(avisos):
+    registros = [
+        {"operacao": "cliente", "cpf": "11111111111", "nome": "Ana"},
+        {"operacao": "cliente", "cpf": "11111111111", "nome": "Ana"},
+        {"operacao": "deposito", "cpf": "22222222222", "valor": "10"},
+    ]
+    resultados = []
+    for resultado in processar_lote(registros, RegistroClientes(), []):
+        assert _AVISOS.get() is avisos
+        avisar(f"linha {resultado['linha']} consumida")
+        resultados.append(resultado)
+
+    assert [resultado["sucesso"] for resultado in resultados] == [True, False, False]
+    assert resultados[1]["motivo"] == "Já existe cliente com esse CPF!"
+    assert resultados[2]["motivo"] != "linha 2 consumida"
+    assert avisos == [f"linha {linha} consumida" for linha in (1, 2, 3)]
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import signal
+import threading
+
+import pytest
+
+from finansys.modelo import RegistroClientes
+from finansys.servidor import ServidorFinanSys, gerar_carga
+
+
+async def conversar(linhas):
+    servidor = ServidorFinanSys(RegistroClientes(), [])
+    porta = (await servidor.iniciar(porta=0)).sockets[0].getsockname()[1]
+    leitor, escritor = await asyncio.open_connection("127.0.0.1", porta)
+    for linha in linhas:
+        escritor.write(linha.encode("utf-8") + b"\n")
+
+    respostas = [json.loads(await asyncio.wait_for(leitor.readline(), 5)) for _ in linhas]
+    escritor.close()
+    await servidor.encerrar()
+    return respostas
+
+
+def enviar(*requisicoes):
+    return asyncio.run(conversar([json.dumps(requisicao) for requisicao in requisicoes]))
+
+
+@pytest.mark.parametrize(
+    "linha",
+    [
+        "[1]",
+        "42",
+        "{nao e json",
+        json.dumps({"id": 7, "operacao": "extrato", "cpf": 12345678901}),
+    ],
+)
+def test_requisicao_malformada_recebe_resposta(linha):
+    (resposta,) = asyncio.run(conversar([linha]))
+    assert resposta["sucesso"] is False
+    assert resposta["motivo"]
+
+
+def test_extrato_com_parametros_invalidos_recebe_resposta():
+    cadastro = (
+        {"id": 1, "operacao": "cliente", "cpf": "11111111111", "nome": "Ana"},
+        {"id": 2, "operacao": "conta", "cpf": "11111111111"},
+    )
+    invalidas = (
+        {"id": 3, "operacao": "extrato", "cpf": "11111111111", "inicio": "bad"},
+        {"id": 4, "operacao": "extrato", "cpf": "11111111111", "tamanho_pagina": "5"},
+        {"id": 5, "operacao": "extrato", "cpf": "11111111111", "cursor": -1},
+    )
+    respostas = {resposta["id"]: resposta for resposta in enviar(*cadastro, *invalidas)}
+
+    assert respostas[2]["sucesso"]
+    for requisicao in invalidas:
+        assert respostas[requisicao["id"]]["sucesso"] is False
+
+
+@pytest.mark.parametrize("campo, valor", [("cursor", "x"), ("cursor", -1), ("tamanho_pagina", 1.5)])
+def test_contas_com_paginacao_invalida_recebe_resposta(campo, valor):
+    (resposta,) = enviar({"id": 9, "operacao": "contas", campo: valor})
+    assert resposta == {"sucesso": False, "motivo": resposta["motivo"], "id": 9}
+
+
+def test_deposito_enviado_apos_conta_espera_o_cadastro():
+    respostas = enviar(
+        {"id": 1, "operacao": "cliente", "cpf": "11111111111", "nome": "Ana"},
+        {"id": 2, "operacao": "conta", "cpf": "111.111.111-11"},
+        {"id": 3, "operacao": "deposito", "cpf": "11111111111", "valor": 10},
+    )
+    assert all(resposta["sucesso"] for resposta in respostas)
+
+
+def test_extrato_roda_fora_do_loop_de_eventos(monkeypatch):
+    threads = []
+    extrato = ServidorFinanSys._extrato
+
+    def registrar_thread(self, requisicao):
+        threads.append(threading.current_thread())
+        return extrato(self, requisicao)
+
+    monkeypatch.setattr(ServidorFinanSys, "_extrato", registrar_thread)
+    (resposta,) = enviar({"id": 1, "operacao": "extrato", "cpf": "11111111111"})
+
+    assert resposta["sucesso"] is False
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_sigterm_encerra_o_servidor():
+    servidor = ServidorFinanSys(RegistroClientes(), [])
+
+    async def principal():
+        servico = asyncio.create_task(servidor.servir(porta=0))
+        while servidor._servidor is None:
+            await asyncio.sleep(0.01)
+        os.kill(os.getpid(), signal.SIGTERM)
+        await asyncio.wait_for(servico, 5)
+
+    asyncio.run(principal())
+    assert not servidor._servidor.is_serving()
+
+
+def test_gerar_carga_distribui_as_requisicoes_entre_contas():
+    async def principal():
+        servidor = ServidorFinanSys(RegistroClientes(), [])
+        porta = (await servidor.iniciar(porta=0)).sockets[0].getsockname()[1]
+        resultado = await gerar_carga(porta=porta, conexoes=3, requisicoes=40, janela=8)
+        await servidor.encerrar()
+        return resultado
+
+    resultado = asyncio.run(principal())
+    assert resultado["requisicoes"] == 120
+    assert (resultado["sucessos"], resultado["falhas"]) == (120, 0)
+    assert set(resultado["operacoes"]) == {"deposito", "saque", "extrato", "contas"}
+
+
+def test_cpfs_desconhecidos_nao_criam_travas():
+    servidor = ServidorFinanSys(RegistroClientes(), [])
+
+    async def principal():
+        return await asyncio.gather(
+            *(servidor.processar({"operacao": "saque", "cpf": f"lixo-{indice}", "valor": 1}) for indice in range(500))
+        )
+
+    respostas = asyncio.run(principal())
+    servidor._executor.shutdown()
+    assert not any(resposta["sucesso"] for resposta in respostas)
+    assert len(servidor._travas_contas) == ServidorFinanSys.FAIXAS_TRAVA
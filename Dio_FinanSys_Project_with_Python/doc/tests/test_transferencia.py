@@ -0,0 +1,86 @@
+import json
+
+from finansys.armazenamento import ArmazenamentoSQLite, DiarioTransacoes
+from finansys.modelo import Deposito, Saque, Transferencia
+
+
+def test_transferencia_com_valor_negativo_e_rejeitada(avisos, nova_conta):
+    pagador, origem = nova_conta("11111111111", 1, saldo=0)
+    _, destino = nova_conta("22222222222", 2, saldo=10000)
+
+    assert not pagador.realizar_transacao(origem, Transferencia(-10000, destino))
+    assert origem.saldo == 0
+    assert destino.saldo == 10000
+    assert len(origem.historico) == 0
+    assert len(destino.historico) == 0
+
+
+def test_transferencia_com_valor_zero_e_rejeitada(avisos, nova_conta):
+    pagador, origem = nova_conta("11111111111", 1, saldo=5000)
+    _, destino = nova_conta("22222222222", 2)
+
+    assert not pagador.realizar_transacao(origem, Transferencia(0, destino))
+    assert (origem.saldo, destino.saldo) == (5000, 0)
+
+
+def test_transferencia_move_o_valor(avisos, nova_conta):
+    pagador, origem = nova_conta("11111111111", 1, saldo=5000)
+    _, destino = nova_conta("22222222222", 2)
+
+    assert pagador.realizar_transacao(origem, Transferencia(1500, destino))
+    assert (origem.saldo, destino.saldo) == (3500, 1500)
+
+
+def test_pernas_da_transferencia_vao_juntas_para_o_sqlite(tmp_path, avisos, nova_conta):
+    armazenamento = ArmazenamentoSQLite(str(tmp_path / "finansys.db"), tamanho_lote=1)
+    pagador, origem = nova_conta("11111111111", 1)
+    recebedor, destino = nova_conta("22222222222", 2)
+    for cliente, conta in ((pagador, origem), (recebedor, destino)):
+        armazenamento.salvar_cliente(cliente)
+        armazenamento.salvar_conta(conta)
+    origem._saldo = 5000
+
+    lotes = []
+    descarregar = armazenamento._descarregar
+
+    def registrar_lote():
+        lotes.append(len(armazenamento._transacoes_pendentes))
+        descarregar()
+
+    armazenamento._descarregar = registrar_lote
+    assert pagador.realizar_transacao(origem, Transferencia(1500, destino))
+    assert lotes == [2]
+    armazenamento.fechar()
+
+
+def test_pernas_da_transferencia_ocupam_uma_linha_do_diario(tmp_path, avisos, nova_conta, simular_queda):
+    prefixo = tmp_path / "finansys"
+    diario = DiarioTransacoes(prefixo)
+    diario.carregar()
+    pagador, origem = nova_conta("11111111111", 1)
+    recebedor, destino = nova_conta("22222222222", 2)
+    for cliente, conta in ((pagador, origem), (recebedor, destino)):
+        diario.salvar_cliente(cliente)
+        diario.salvar_conta(conta)
+    assert pagador.realizar_transacao(origem, Deposito(5000))
+    assert pagador.realizar_transacao(origem, Transferencia(1500, destino))
+    simular_queda(diario)
+
+    ultima = json.loads(diario._caminho_segmento(diario._segmento).read_text(encoding="utf-8").splitlines()[-1])
+    assert [perna["conta"] for perna in ultima["pernas"]] == [1, 2]
+
+    diario = DiarioTransacoes(prefixo)
+    _, contas = diario.carregar()
+    assert [conta.saldo for conta in contas] == [3500, 1500]
+    diario.fechar()
+
+
+def test_transferencias_recebidas_nao_consomem_o_limite_diario(avisos, nova_conta):
+    recebedor, destino = nova_conta("33333333333", 3)
+    for cpf, numero in (("11111111111", 1), ("22222222222", 2)):
+        pagador, origem = nova_conta(cpf, numero, saldo=5000)
+        assert pagador.realizar_transacao(origem, Transferencia(1000, destino))
+
+    assert destino.historico.quantidade_do_dia() == 0
+    assert recebedor.realizar_transacao(destino, Saque(500))
+    assert destino.saldo == 1500